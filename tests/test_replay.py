@@ -0,0 +1,24 @@
+import random
+
+from bots import KitePolicy
+from core import GameCore
+from replay import InputRecorder, InputRecording, run_outcome
+from tower_rush import replay_run
+
+
+def test_restart_mid_run_saves_a_replayable_recording(tmp_path):
+    path = str(tmp_path / "run.npz")
+    recorder = InputRecorder(KitePolicy(random.Random(3)), path)
+    game = GameCore(input_source=recorder)
+    game.start_run(3)
+    while game.state == "playing" and game.floor_number < 2:
+        game.run_headless(game.tick_rate)
+    assert game.state == "playing"
+    played = run_outcome(game)
+
+    game.reset_game()
+
+    recording = InputRecording.load(path)
+    assert recording.seed == 3
+    assert recording.outcome == played
+    assert replay_run(path) == 0
@@ -0,0 +1,88 @@
+"""Startup helpers: a persistent font-path cache and a per-step timing report."""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import pygame
+
+FONT_CACHE_FILE = "fonts.json"
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tower_rush")
+
+
+class FontCache:
+    """Remember which file each ``SysFont`` name resolved to.
+
+    ``pygame.font.SysFont`` scans every installed font (via ``fc-list`` on
+    Linux) the first time it is called. The resolved paths are stored in
+    ``cache_dir`` so later launches open the file directly. A name that
+    resolved to nothing maps to ``None``, pygame's bundled default font,
+    exactly as ``SysFont`` would fall back.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.path = os.path.join(cache_dir, FONT_CACHE_FILE) if cache_dir else None
+        self.paths = {}
+        self.resolved = 0
+        self.dirty = False
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path) as handle:
+                    self.paths = json.load(handle)
+            except (OSError, ValueError):
+                self.paths = {}
+
+    def resolve(self, name):
+        path = self.paths.get(name, "")
+        if path is None or (path and os.path.exists(path)):
+            return path
+        path = pygame.font.match_font(name)
+        self.paths[name] = path
+        self.resolved += 1
+        self.dirty = True
+        return path
+
+    def font(self, name, size):
+        return pygame.font.Font(self.resolve(name), size)
+
+    def save(self):
+        if not self.dirty or not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as handle:
+                json.dump(self.paths, handle, indent=2, sort_keys=True)
+        except OSError:
+            return
+        self.dirty = False
+
+
+class StartupReport:
+    """Wall-clock time per named initialization step, from any thread."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = []
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, started - self.started, time.perf_counter() - started))
+
+    def mark(self, name):
+        """Record an instant, e.g. the first presented frame."""
+        self.steps.append((name, time.perf_counter() - self.started, 0.0))
+
+    def format(self):
+        lines = [f"{'step':28s} {'at ms':>9s} {'took ms':>9s}"]
+        for name, offset, duration in self.steps:
+            lines.append(f"{name:28s} {offset * 1000:9.1f} {duration * 1000:9.1f}")
+        return "\n".join(lines)
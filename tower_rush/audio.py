@@ -0,0 +1,168 @@
+"""Synthesized placeholder sounds and a cache for their sample buffers."""
+
+import os
+
+import numpy as np
+import pygame
+
+
+def synthesize_beep(frequency, duration, volume, sample_rate):
+    """Return a sine beep as 16-bit mono samples, computed in one array pass."""
+    sample_count = int(sample_rate * duration)
+    amplitude = int(32767 * volume)
+    angle = 2 * np.pi * frequency * np.arange(sample_count) / sample_rate
+    return (amplitude * np.sin(angle)).astype(np.int16)
+
+
+def repitch(samples, pitch):
+    """Resample so playback runs ``pitch`` times faster (and higher)."""
+    if pitch == 1.0:
+        return samples
+    positions = np.arange(0, len(samples) - 1, pitch)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
+
+def regain(samples, gain):
+    if gain == 1.0:
+        return samples
+    return np.clip(samples * gain, -32768, 32767).astype(np.int16)
+
+
+class SoundBank:
+    """Generated sounds cached by frequency, duration, volume and sample rate.
+
+    Sample buffers are kept in memory and, when ``cache_dir`` is given, as
+    ``.npy`` files so later launches skip synthesis. ``variant`` derives a
+    pitch- or volume-shifted copy of a cached buffer instead of synthesizing
+    again. Requires an initialised mixer; its rate and channel count are
+    read once at construction.
+    """
+
+    def __init__(self, cache_dir=None):
+        mixer_init = pygame.mixer.get_init()
+        if mixer_init is None:
+            raise pygame.error("Mixer not initialised")
+        self.sample_rate, _, self.channels = mixer_init
+        self.cache_dir = cache_dir
+        self.buffers = {}
+        self.sounds = {}
+        self.synthesized = 0
+        self.loaded = 0
+
+    def _path(self, key):
+        frequency, duration, volume, sample_rate = key
+        name = f"beep_{frequency:g}_{duration:g}_{volume:g}_{sample_rate}.npy"
+        return os.path.join(self.cache_dir, name)
+
+    def samples(self, frequency, duration, volume):
+        key = (frequency, duration, volume, self.sample_rate)
+        samples = self.buffers.get(key)
+        if samples is not None:
+            return samples
+        path = self._path(key) if self.cache_dir else None
+        if path and os.path.exists(path):
+            samples = np.load(path)
+            self.loaded += 1
+        else:
+            samples = synthesize_beep(frequency, duration, volume, self.sample_rate)
+            self.synthesized += 1
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                partial = path + ".tmp"
+                with open(partial, "wb") as handle:
+                    np.save(handle, samples)
+                os.replace(partial, path)
+        self.buffers[key] = samples
+        return samples
+
+    def _sound(self, samples):
+        if self.channels > 1:
+            samples = np.repeat(samples, self.channels)
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+
+    def beep(self, frequency, duration, volume):
+        return self.variant(frequency, duration, volume)
+
+    def variant(self, frequency, duration, volume, pitch=1.0, gain=1.0):
+        """A Sound for the beep, optionally repitched and/or scaled in volume."""
+        key = (frequency, duration, volume, pitch, gain)
+        sound = self.sounds.get(key)
+        if sound is None:
+            samples = self.samples(frequency, duration, volume)
+            sound = self.sounds[key] = self._sound(regain(repitch(samples, pitch), gain))
+        return sound
+
+
+PRIORITY_LOW = 0
+PRIORITY_HIGH = 1
+MIXER_CHANNELS = 16
+RESERVED_CHANNELS = 2
+DEFAULT_MAX_VOICES = 4
+
+
+class SoundDispatcher:
+    """Collect a frame's sound requests and play each distinct sound once.
+
+    Identical requests made during a frame (a piercing volley landing on a
+    dozen enemies) collapse into one ``play``. Low-priority sounds have a
+    cap on how many copies may ring at once and are skipped when it is hit
+    or no channel is free. The first ``reserved`` mixer channels are kept
+    for high-priority sounds, which may also steal the longest-running
+    ordinary channel, so damage cues are never dropped.
+    """
+
+    def __init__(self, channels=MIXER_CHANNELS, reserved=RESERVED_CHANNELS):
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(reserved)
+        self.reserved = [pygame.mixer.Channel(index) for index in range(reserved)]
+        self.settings = {}
+        self.pending = {}
+        self.requested = 0
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def configure(self, sound, priority=PRIORITY_LOW, max_voices=DEFAULT_MAX_VOICES):
+        """Set how ``sound`` competes for channels; unconfigured sounds are low priority."""
+        if sound is not None:
+            self.settings[sound] = (priority, max_voices)
+
+    def request(self, sound):
+        self.pending[sound] = self.pending.get(sound, 0) + 1
+        self.requested += 1
+
+    def _channel(self, priority):
+        if priority == PRIORITY_HIGH:
+            for channel in self.reserved:
+                if not channel.get_busy():
+                    return channel
+            return pygame.mixer.find_channel(True)
+        return pygame.mixer.find_channel()
+
+    def flush(self):
+        """Play this frame's requests, highest priority first."""
+        if not self.pending:
+            return
+        settings = self.settings
+        default = (PRIORITY_LOW, DEFAULT_MAX_VOICES)
+        requests = sorted(self.pending.items(), key=lambda item: -settings.get(item[0], default)[0])
+        self.pending.clear()
+        for sound, count in requests:
+            priority, max_voices = settings.get(sound, default)
+            self.merged += count - 1
+            channel = None
+            if priority == PRIORITY_HIGH or sound.get_num_channels() < max_voices:
+                channel = self._channel(priority)
+            if channel is None:
+                self.dropped += 1
+                continue
+            channel.play(sound)
+            self.played += 1
+
+    def stats(self):
+        return {
+            "requested": self.requested,
+            "played": self.played,
+            "merged": self.merged,
+            "dropped": self.dropped,
+        }
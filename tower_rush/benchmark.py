@@ -0,0 +1,260 @@
+"""Seeded stress scenarios that time the update and draw hot paths.
+
+Every scenario builds a real game under the SDL dummy video driver, plays
+a scripted input for a warm-up, then times each hot-path method per tick
+and reports percentiles. Each scenario runs several times and every
+statistic keeps its fastest run, since background load only ever adds time.
+Results can be saved as a baseline and later runs are compared against it;
+a phase whose p50 or p95 grew by more than the threshold, and by more than
+an absolute floor in milliseconds, is flagged and the process exits
+non-zero.
+
+    python benchmark.py --save-baseline
+    python benchmark.py --scenario horde_floor_300 --ticks 300
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from controls import InputState
+from core import HEIGHT, WIDTH, floor_enemy_count
+from tower_rush import TowerRushGame
+
+PHASES = (
+    "update_bullets",
+    "update_enemies",
+    "update_enemy_projectiles",
+    "draw_gameplay",
+    "draw_hud",
+)
+PERCENTILES = (50, 95, 99)
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA = 0.05
+DEFAULT_REPEATS = 5
+
+
+class CircleStrafe:
+    """Walk a slow circle while sweeping aim around the arena and firing."""
+
+    def __init__(self):
+        self.tick = 0
+
+    def poll(self, game):
+        self.tick += 1
+        angle = self.tick * 0.03
+        sweep = self.tick * 0.11
+        return InputState(
+            (math.cos(angle), math.sin(angle)),
+            (WIDTH / 2 + 600 * math.cos(sweep), HEIGHT / 2 + 350 * math.sin(sweep)),
+            True,
+        )
+
+
+def setup_boss_floor_100(game):
+    """Floor 100 milestone boss, left alive so homing cores keep coming."""
+    game.floor_number = 100
+    game.spawn_floor()
+    game.active_boss.health = game.active_boss.max_health = 10**9
+
+
+def setup_horde_floor_300(game):
+    """A floor-300 wave; 300 is a boss floor, so the horde is spawned directly."""
+    game.floor_number = 300
+    game.enemies.clear()
+    game.active_boss = None
+    for _ in range(floor_enemy_count(300)):
+        game.create_enemy()
+
+
+def setup_max_firepower(game):
+    """Maxed workshop plus Multi Shot and Piercing against a full floor-41 wave."""
+    game.max_out_meta_upgrades()
+    game.apply_meta_to_player()
+    game.floor_number = 41
+    game.spawn_floor()
+
+
+def refresh_max_firepower(game):
+    """Keep the buffs up and top the wave back up so there is always something to hit."""
+    for name in ("multi_shot", "piercing", "fire_rate"):
+        game.player.apply_powerup(name, game.sim_time)
+    for _ in range(floor_enemy_count(game.floor_number) - len(game.enemies)):
+        game.create_enemy()
+
+
+SCENARIOS = {
+    "boss_floor_100": (setup_boss_floor_100, None),
+    "horde_floor_300": (setup_horde_floor_300, None),
+    "max_firepower": (setup_max_firepower, refresh_max_firepower),
+}
+
+
+def _timed(method, samples):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        result = method(*args, **kwargs)
+        samples.append(time.perf_counter() - started)
+        return result
+
+    return wrapper
+
+
+def run_scenario(name, ticks=600, warmup=120, seed=0):
+    """Play ``name`` and return {phase: {"p50": ms, ...}} for every phase."""
+    setup, refresh = SCENARIOS[name]
+    game = TowerRushGame(input_source=CircleStrafe())
+    game.start_run(seed)
+    setup(game)
+    # After setup: applying workshop upgrades resets lives.
+    game.lives = 10**9
+    samples = {}
+    for phase in PHASES:
+        samples[phase] = []
+        setattr(game, phase, _timed(getattr(game, phase), samples[phase]))
+    for tick in range(warmup + ticks):
+        if tick == warmup:
+            assert game.state == "playing" and len(game.enemies) > 0, f"{name}: nothing left to simulate after warm-up"
+            for phase in PHASES:
+                samples[phase].clear()
+        if refresh is not None:
+            refresh(game)
+        game.update_gameplay(game.tick_dt)
+        game.draw_gameplay()
+    report = {}
+    for phase in PHASES:
+        times = np.array(samples[phase]) * 1000
+        if times.size == 0:
+            continue
+        stats = {f"p{p}": round(float(v), 4) for p, v in zip(PERCENTILES, np.percentile(times, PERCENTILES))}
+        stats["mean"] = round(float(times.mean()), 4)
+        stats["calls"] = int(times.size)
+        report[phase] = stats
+    report["_entities"] = {
+        "enemies": len(game.enemies),
+        "bullets": len(game.bullets),
+        "enemy_projectiles": len(game.enemy_projectiles),
+    }
+    report["_pool_peaks"] = {name: stats["high_water"] for name, stats in game.pool_stats().items()}
+    return report
+
+
+def run_scenarios(names, repeats=DEFAULT_REPEATS, ticks=600, warmup=120, seed=0):
+    """Run every scenario ``repeats`` times; keep each statistic's fastest value.
+
+    Each run gets a fresh worker process, since timings drift more between
+    processes than within one, and the scenarios take turns so a slow
+    stretch on the machine does not land on just one of them.
+    """
+    jobs = [(name, ticks, warmup, seed) for _ in range(repeats) for name in names]
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        reports = pool.starmap(run_scenario, jobs, chunksize=1)
+    results = {}
+    for (name, *_), report in zip(jobs, reports):
+        best = results.setdefault(name, report)
+        if best is report:
+            continue
+        for phase in PHASES:
+            if phase in best and phase in report:
+                best[phase] = {key: min(best[phase][key], report[phase][key]) for key in best[phase]}
+    return results
+
+
+def find_regressions(results, baseline, threshold, min_delta=DEFAULT_MIN_DELTA):
+    """Return (scenario, phase, stat, old, new) for every slowdown past threshold.
+
+    A slowdown also has to exceed ``min_delta`` milliseconds, so phases that
+    take a few microseconds are not flagged for timer jitter.
+    """
+    regressions = []
+    for scenario, phases in results.items():
+        for phase, stats in phases.items():
+            old = baseline.get(scenario, {}).get(phase)
+            if phase.startswith("_") or old is None:
+                continue
+            for key in ("p50", "p95"):
+                new = stats[key]
+                if new > old[key] * (1 + threshold) and new - old[key] > min_delta:
+                    regressions.append((scenario, phase, key, old[key], new))
+    return regressions
+
+
+def format_report(results):
+    lines = []
+    for scenario, phases in results.items():
+        entities = phases.get("_entities", {})
+        lines.append(f"{scenario}  " + "  ".join(f"{k}={v}" for k, v in entities.items()))
+        peaks = phases.get("_pool_peaks", {})
+        if peaks:
+            lines.append("  pool peaks: " + "  ".join(f"{k}={v}" for k, v in peaks.items()))
+        for phase in PHASES:
+            stats = phases.get(phase)
+            if stats is None:
+                continue
+            cells = "  ".join(f"{key} {stats[key]:8.3f}" for key in ("p50", "p95", "p99", "mean"))
+            lines.append(f"  {phase:26s} {cells}  ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tower Rush hot-path benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; default all")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="flag p50/p95 slowdowns beyond this fraction (default 0.2)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA,
+        help="ignore slowdowns smaller than this many milliseconds (default 0.05)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help="runs per scenario; each statistic keeps its fastest run (default 5)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_scenarios(args.scenario or sorted(SCENARIOS), args.repeat, args.ticks, args.warmup, args.seed)
+    print(format_report(results))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    regressions = find_regressions(results, baseline, args.threshold, args.min_delta)
+    for scenario, phase, key, old, new in regressions:
+        print(f"REGRESSION {scenario}.{phase} {key}: {old:.3f} -> {new:.3f} ms")
+    if not regressions:
+        print("no regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
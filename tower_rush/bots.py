@@ -0,0 +1,253 @@
+"""Scripted bot policies and a multiprocess batch runner for balance passes.
+
+A policy is an input source: ``poll(game)`` reads the live game state and
+returns one tick's InputState. Each batch run builds a headless game, seeds
+it, lets the policy play until death or the tick limit, and reports the
+floor reached, time spent per floor, coins earned, cause of death and the
+bullet and enemy-projectile pool high-water marks per floor tier.
+
+    python bots.py --runs 2000 --policy kite --output results.jsonl
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from collections import Counter
+
+import numpy as np
+
+from controls import InputState
+from core import HEIGHT, POOL_TIER_FLOORS, TICK_RATE, WIDTH, GameCore, target_nearest
+
+DANGER_RADIUS = 260
+POWERUP_GRAB_RADIUS = 320
+WANDER_TURN_TICKS = (20, 90)
+
+
+class Policy:
+    """Map game state to movement, aim and fire for one tick."""
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def poll(self, game):
+        raise NotImplementedError
+
+    def aim_at_nearest(self, game):
+        if not game.enemies:
+            return None
+        return target_nearest(game, 1)[0]
+
+
+class IdlePolicy(Policy):
+    """Stand still and never shoot; a floor for the difficulty curve."""
+
+    def poll(self, game):
+        return InputState()
+
+
+class TurretPolicy(Policy):
+    """Hold position and fire at the closest enemy."""
+
+    def poll(self, game):
+        aim = self.aim_at_nearest(game)
+        if aim is None:
+            return InputState()
+        return InputState(aim=aim, fire=True)
+
+
+class KitePolicy(Policy):
+    """Back away from nearby enemies and shots while firing at the closest.
+
+    Each threat inside DANGER_RADIUS pushes the player away with a weight
+    that grows as it gets closer. With nothing close, the bot walks to the
+    nearest power-up or drifts back toward the middle of the arena.
+    """
+
+    def poll(self, game):
+        player = game.player.position
+        push_x = 0.0
+        push_y = 0.0
+        for store in (game.enemies, game.enemy_projectiles):
+            count = store.count
+            if not count:
+                continue
+            offset = (player.x, player.y) - store.position[:count]
+            distance = np.sqrt((offset * offset).sum(axis=1))
+            distance = np.maximum(distance - store.radius[:count], 1.0)
+            near = store.alive[:count] & (distance < DANGER_RADIUS)
+            if near.any():
+                weight = (1.0 / distance[near]) ** 2
+                push_x += float((offset[near, 0] * weight).sum())
+                push_y += float((offset[near, 1] * weight).sum())
+        if push_x or push_y:
+            # Walls are threats too: lean back toward the middle near edges.
+            push_x += 1.0 / max(player.x, 1.0) ** 2 - 1.0 / max(WIDTH - player.x, 1.0) ** 2
+            push_y += 1.0 / max(player.y, 1.0) ** 2 - 1.0 / max(HEIGHT - player.y, 1.0) ** 2
+            # The weights only set the direction; flee at full speed.
+            length = math.hypot(push_x, push_y)
+            move = (push_x / length, push_y / length)
+        else:
+            move = self.idle_target(game) - player
+            if move.length_squared() < 16:
+                move = (0.0, 0.0)
+        aim = self.aim_at_nearest(game)
+        if aim is None:
+            return InputState(move=move)
+        return InputState(move=move, aim=aim, fire=True)
+
+    def idle_target(self, game):
+        player = game.player.position
+        best = None
+        best_distance = POWERUP_GRAB_RADIUS
+        for powerup in game.powerups:
+            distance = player.distance_to(powerup.position)
+            if distance < best_distance:
+                best = powerup.position
+                best_distance = distance
+        if best is None:
+            return type(player)(WIDTH / 2, HEIGHT / 2)
+        return best
+
+
+class WanderPolicy(Policy):
+    """Random walk with seeded turns, firing at the closest enemy."""
+
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.move = (0.0, 0.0)
+        self.turn_in = 0
+
+    def poll(self, game):
+        if self.turn_in <= 0:
+            angle = self.rng.uniform(0.0, 2 * math.pi)
+            self.move = (math.cos(angle), math.sin(angle))
+            self.turn_in = self.rng.randint(*WANDER_TURN_TICKS)
+        self.turn_in -= 1
+        aim = self.aim_at_nearest(game)
+        if aim is None:
+            return InputState(move=self.move)
+        return InputState(move=self.move, aim=aim, fire=True)
+
+
+POLICIES = {
+    "idle": IdlePolicy,
+    "turret": TurretPolicy,
+    "kite": KitePolicy,
+    "wander": WanderPolicy,
+}
+
+
+def run_bot(seed, policy="kite", max_ticks=TICK_RATE * 60 * 30, max_meta=False):
+    """Play one seeded headless run and return its summary."""
+    bot = POLICIES[policy](random.Random(seed))
+    game = GameCore(input_source=bot)
+    if max_meta:
+        game.max_out_meta_upgrades()
+    game.start_run(seed)
+    ticks = game.run_headless(max_ticks)
+    if game.state == "playing":
+        game.record_pool_peaks()
+    return {
+        "seed": seed,
+        "policy": policy,
+        "floor": game.floor_number,
+        "score": game.score,
+        "coins": game.run_currency,
+        "ticks": ticks,
+        "seconds": round(game.sim_time / 1000, 3),
+        "floor_seconds": [round(ms / 1000, 3) for ms in game.floor_times],
+        "cause": game.death_cause or "timeout",
+        "pool_peaks": {str(tier): peaks for tier, peaks in sorted(game.pool_tier_peaks.items())},
+    }
+
+
+def _run_job(job):
+    return run_bot(*job)
+
+
+def run_batch(seeds, policy="kite", max_ticks=TICK_RATE * 60 * 30, max_meta=False, workers=None):
+    """Yield run summaries as they finish, fanned out over ``workers`` processes."""
+    jobs = [(seed, policy, max_ticks, max_meta) for seed in seeds]
+    if workers == 1:
+        for job in jobs:
+            yield _run_job(job)
+        return
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_run_job, jobs, chunksize)
+
+
+def summarize(results):
+    floors = [result["floor"] for result in results]
+    coins = [result["coins"] for result in results]
+    causes = Counter(result["cause"] for result in results)
+    lines = [
+        f"runs: {len(results)}",
+        f"floor: mean {statistics.fmean(floors):.2f}  median {statistics.median(floors)}"
+        f"  max {max(floors)}",
+        f"coins: mean {statistics.fmean(coins):.1f}  median {statistics.median(coins)}",
+        "cause of death: "
+        + ", ".join(f"{cause} {count}" for cause, count in causes.most_common()),
+    ]
+    tiers = {}
+    for result in results:
+        for tier, peaks in result["pool_peaks"].items():
+            merged = tiers.setdefault(int(tier), dict.fromkeys(peaks, 0))
+            for name, peak in peaks.items():
+                merged[name] = max(merged[name], peak)
+    for tier, peaks in sorted(tiers.items()):
+        first = tier * POOL_TIER_FLOORS + 1
+        lines.append(
+            f"pool peaks, floors {first}-{first + POOL_TIER_FLOORS - 1}: "
+            + "  ".join(f"{name} {peak}" for name, peak in peaks.items())
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded Tower Rush bot batches")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="kite")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes (default: one per core; 1 runs in-process)",
+    )
+    parser.add_argument(
+        "--max-minutes",
+        type=float,
+        default=30.0,
+        help="simulated minutes before a run counts as a timeout",
+    )
+    parser.add_argument("--max-meta", action="store_true", help="start with every workshop upgrade")
+    parser.add_argument("--output", help="write one JSON result per line to this file")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + args.runs)
+    max_ticks = int(args.max_minutes * 60 * TICK_RATE)
+    started = time.perf_counter()
+    results = []
+    for result in run_batch(seeds, args.policy, max_ticks, args.max_meta, args.workers):
+        results.append(result)
+    elapsed = time.perf_counter() - started
+    results.sort(key=lambda result: result["seed"])
+    if args.output:
+        with open(args.output, "w") as handle:
+            for result in results:
+                handle.write(json.dumps(result) + "\n")
+    print(summarize(results))
+    ticks = sum(result["ticks"] for result in results)
+    print(f"{elapsed:.1f}s wall, {len(results) / elapsed:.1f} runs/s, {ticks / elapsed:.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
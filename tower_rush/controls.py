@@ -0,0 +1,38 @@
+"""Clocks and input sources that drive the simulation.
+
+The game only talks to these objects, so a headless run can swap the
+window-backed versions (``tower_rush.PygameInput`` and ``FrameClock``) for
+a fixed-step clock and scripted input. Nothing here imports pygame.
+"""
+
+
+class InputState:
+    """One tick's worth of player intent.
+
+    ``move`` is a direction (normalized by the player if longer than one),
+    ``aim`` is the world point manual shots travel toward.
+    """
+
+    __slots__ = ("move", "aim", "fire")
+
+    def __init__(self, move=(0.0, 0.0), aim=(0.0, 0.0), fire=False):
+        self.move = move
+        self.aim = aim
+        self.fire = fire
+
+
+class IdleInput:
+    """Stand still and never fire; the default for headless games."""
+
+    def poll(self, game):
+        return InputState()
+
+
+class StepClock:
+    """Report the same elapsed time every frame, independent of real time."""
+
+    def __init__(self, step):
+        self.step = step
+
+    def tick(self):
+        return self.step
@@ -0,0 +1,1327 @@
+"""Tower Rush rules: entities, scaling, meta progression and collisions.
+
+Everything needed to play a run without a window lives here, and nothing
+here imports pygame, so bots, analysis scripts and worker processes start
+without loading SDL. ``tower_rush.py`` draws, plays sound and reads the
+keyboard and mouse on top of ``GameCore``.
+"""
+
+import math
+import random
+
+import numpy as np
+
+from controls import IdleInput, StepClock
+from profiler import Profiler
+from spatial import SpatialGrid, smallest_rows
+from stores import (
+    DESTROYABLE,
+    HOMING,
+    PIERCING,
+    EnemyStore,
+    EnemyView,
+    ProjectileStore,
+    ProjectileView,
+)
+from vector import Vector2
+
+WIDTH, HEIGHT = 1600, 900
+TICK_RATE = 60
+MAX_CATCH_UP_TICKS = 5
+
+PLAYER_SPEED = 240
+PLAYER_RADIUS = 20
+PLAYER_COLOR = (80, 160, 255)
+INVULNERABILITY_DURATION = 2000
+HIT_FLASH_DURATION = 200
+
+BULLET_SPEED = 600
+BULLET_BASE_RADIUS = 6
+BULLET_BIG_MULTIPLIER = 1.6
+BULLET_SPREAD_ANGLE = 14
+BULLET_COLOR = (255, 220, 120)
+BULLET_DAMAGE = 1
+ENEMY_PROJECTILE_RADIUS = 8
+BIG_BULLET_BONUS = 1
+MULTI_SHOT_COUNT = 3
+AUTO_FIRE_BASE_COOLDOWN = 2.2
+AUTO_FIRE_COOLDOWN_STEP = 0.3
+AUTO_FIRE_TARGETING = "nearest"
+
+ENEMY_RADIUS = 24
+ENEMY_BASE_SPEED = 100
+ENEMY_SPEED_INCREMENT = 4
+ENEMY_SPAWN_MARGIN = 40
+BASE_LIVES = 3
+
+ENEMY_VARIANTS = (
+    {
+        "name": "raider",
+        "color": (220, 70, 70),
+        "speed_mult": 1.0,
+        "health": 1,
+        "radius": ENEMY_RADIUS,
+        "score": 1,
+        "reward": 2,
+    },
+    {
+        "name": "brute",
+        "color": (240, 150, 70),
+        "speed_mult": 0.72,
+        "health": 3,
+        "radius": ENEMY_RADIUS + 4,
+        "score": 2,
+        "reward": 3,
+    },
+    {
+        "name": "warden",
+        "color": (120, 200, 150),
+        "speed_mult": 0.55,
+        "health": 5,
+        "radius": ENEMY_RADIUS + 6,
+        "score": 3,
+        "reward": 4,
+    },
+    {
+        "name": "speedster",
+        "color": (255, 230, 120),
+        "speed_mult": 1.35,
+        "health": 2,
+        "radius": ENEMY_RADIUS - 4,
+        "score": 3,
+        "reward": 2,
+        "random_move": True,
+    },
+    {
+        "name": "artillery",
+        "color": (180, 120, 255),
+        "speed_mult": 0.45,
+        "health": 4,
+        "radius": ENEMY_RADIUS + 2,
+        "score": 4,
+        "reward": 3,
+        "ranged": True,
+        "fire_interval": 1800,
+        "projectile_speed": 420,
+        "projectile_damage": 1,
+        "projectile_color": (255, 160, 90),
+    },
+)
+
+BOSS_FLOOR_INTERVAL = 5
+BOSS_BASE_SPEED = 80
+BOSS_SPEED_INCREMENT = 4
+BOSS_BASE_HEALTH = 24
+BOSS_HEALTH_INCREMENT = 6
+BOSS_RADIUS = 52
+BOSS_COLOR = (255, 90, 160)
+BOSS_SCORE_VALUE = 10
+BOSS_REWARD_BASE = 40
+BOSS_REWARD_INCREMENT = 12
+
+POWERUP_SIZE = 26
+POWERUP_DURATION = 8000
+POWERUP_INTERVAL = 25000
+NORMAL_POWERUPS = ("speed", "fire_rate", "big_bullet", "multi_shot", "piercing")
+SESSION_POWERUPS = ("perma_fire_rate", "perma_damage")
+POWERUP_WEIGHTS = {
+    "speed": 3,
+    "fire_rate": 3,
+    "big_bullet": 2,
+    "multi_shot": 2,
+    "piercing": 2,
+}
+POWERUP_COLORS = {
+    "speed": (120, 220, 255),
+    "fire_rate": (255, 200, 90),
+    "big_bullet": (255, 150, 120),
+    "multi_shot": (190, 160, 255),
+    "piercing": (140, 255, 200),
+    "perma_fire_rate": (255, 110, 180),
+    "perma_damage": (255, 90, 120),
+}
+
+FIRE_COOLDOWN = 0.25
+SPEED_MULTIPLIER = 1.5
+FIRE_RATE_MULTIPLIER = 0.6
+PERMA_FIRE_RATE_MULTIPLIER = 0.9
+PERMA_DAMAGE_BONUS = 1
+
+FLOOR_REWARD_BASE = 12
+FLOOR_REWARD_SCALE = 4
+FLOOR_DELAY = 2000
+
+COLLISION_CELL_SIZE = 64
+BULLET_POOL_CAPACITY = 512
+ENEMY_PROJECTILE_POOL_CAPACITY = 256
+POOL_TIER_FLOORS = 10
+
+META_UPGRADE_DEFS = {
+    "speed": {
+        "label": "Agility",
+        "base_cost": 120,
+        "cost_scale": 1.65,
+        "max_level": 8,
+        "description": "+5% move speed",
+    },
+    "fire_rate": {
+        "label": "Trigger Discipline",
+        "base_cost": 130,
+        "cost_scale": 1.7,
+        "max_level": 8,
+        "description": "+8% fire rate",
+    },
+    "starting_hp": {
+        "label": "Reserves",
+        "base_cost": 160,
+        "cost_scale": 1.8,
+        "max_level": 5,
+        "description": "+1 starting heart",
+    },
+    "money": {
+        "label": "Spoils Bonus",
+        "base_cost": 140,
+        "cost_scale": 1.7,
+        "max_level": 6,
+        "description": "+12% more coins",
+    },
+    "damage": {
+        "label": "Ballistics",
+        "base_cost": 150,
+        "cost_scale": 1.75,
+        "max_level": 6,
+        "description": "+1 base damage",
+    },
+    "auto_fire": {
+        "label": "Auto Salvo",
+        "base_cost": 220,
+        "cost_scale": 1.85,
+        "max_level": 5,
+        "description": "Unlocks auto fire, higher levels shorten cooldown",
+    },
+}
+
+META_UPGRADE_ORDER = [
+    "speed",
+    "fire_rate",
+    "starting_hp",
+    "money",
+    "damage",
+    "auto_fire",
+]
+
+
+def circle_collision(pos_a, radius_a, pos_b, radius_b):
+    return (pos_a - pos_b).length_squared() <= (radius_a + radius_b) ** 2
+
+
+def circles_overlap(ax, ay, radius_a, bx, by, radius_b):
+    dx = ax - bx
+    dy = ay - by
+    return dx * dx + dy * dy <= (radius_a + radius_b) ** 2
+
+
+def floor_enemy_count(floor_number):
+    return max(4, int(4 + floor_number * 1.4))
+
+
+def enemy_variant_pool(floor_number):
+    pool = [ENEMY_VARIANTS[0]]
+    if floor_number >= 3:
+        pool.append(ENEMY_VARIANTS[1])
+    if floor_number >= 5:
+        pool.append(ENEMY_VARIANTS[2])
+    if floor_number >= 4:
+        pool.append(ENEMY_VARIANTS[3])
+    if floor_number >= 6:
+        pool.append(ENEMY_VARIANTS[4])
+    return pool
+
+
+def enemy_stats(variant, floor_number):
+    """Speed and health of ``variant`` on ``floor_number``."""
+    boss_clears = max(0, (floor_number - 1) // BOSS_FLOOR_INTERVAL)
+    base_speed = ENEMY_BASE_SPEED + boss_clears * ENEMY_SPEED_INCREMENT
+    speed = base_speed * variant.get("speed_mult", 1.0)
+    health = variant["health"] + boss_clears
+    if variant["name"] == "speedster":
+        health = 1
+        speed *= 1.1
+    return speed, health
+
+
+def boss_stats(floor_number):
+    """Keyword stats for the boss guarding ``floor_number``."""
+    boss_cycle_index = max(0, floor_number // BOSS_FLOOR_INTERVAL - 1)
+    floor_health_bonus = max(0, floor_number - 1) * (BOSS_HEALTH_INCREMENT // 2 + 1)
+    health = BOSS_BASE_HEALTH + floor_health_bonus + boss_cycle_index * (BOSS_HEALTH_INCREMENT + 10)
+    speed = BOSS_BASE_SPEED + boss_cycle_index * (BOSS_SPEED_INCREMENT + 2)
+    fire_interval = max(700, 1400 - boss_cycle_index * 130)
+    projectile_speed = 480 + boss_cycle_index * 20
+    projectile_damage = 2 + boss_cycle_index // 2
+    milestone = floor_number in {25, 50, 75, 100}
+    if milestone:
+        health += 80
+        speed += 18
+        fire_interval = max(600, fire_interval - 200)
+        projectile_damage += 1
+    special_interval = max(1500, 2400 - boss_cycle_index * 180)
+    special_speed = 180 + boss_cycle_index * 20
+    special_damage = 2 + (1 if milestone else 0)
+    special_hp = 3 + boss_cycle_index // 2 + (2 if milestone else 0)
+    special_radius = 16 if milestone else 12
+    special_color = (255, 220, 140) if milestone else (255, 205, 140)
+    if milestone:
+        special_interval = max(1200, special_interval - 200)
+        special_speed = min(360, special_speed + 60)
+    return {
+        "health": health,
+        "speed": speed,
+        "fire_interval": fire_interval,
+        "projectile_speed": projectile_speed,
+        "projectile_damage": projectile_damage,
+        "special_shot_interval": special_interval,
+        "special_shot_speed": special_speed,
+        "special_shot_damage": special_damage,
+        "special_shot_hp": special_hp,
+        "special_shot_radius": special_radius,
+        "special_projectile_color": special_color,
+    }
+
+
+def floor_clear_reward(floor_number):
+    return FLOOR_REWARD_BASE + (floor_number - 1) * FLOOR_REWARD_SCALE
+
+
+def boss_reward(floor_number):
+    return BOSS_REWARD_BASE + (
+        max(0, floor_number // BOSS_FLOOR_INTERVAL - 1)
+    ) * BOSS_REWARD_INCREMENT
+
+
+def meta_effects(upgrades):
+    """Derived player stats for a workshop loadout (name -> level)."""
+    auto_level = upgrades["auto_fire"]
+    return {
+        "speed_multiplier": 1.0 + 0.05 * upgrades["speed"],
+        "fire_rate_multiplier": 0.92 ** upgrades["fire_rate"],
+        "starting_lives": BASE_LIVES + upgrades["starting_hp"],
+        "money_multiplier": 1.0 + 0.12 * upgrades["money"],
+        "damage_bonus": upgrades["damage"],
+        "auto_fire_level": auto_level,
+        "auto_fire_cooldown": max(
+            0.35,
+            AUTO_FIRE_BASE_COOLDOWN * (0.82 ** auto_level),
+        ),
+        "auto_fire_shots": (
+            0 if auto_level == 0 else min(3, 1 + auto_level // 2)
+        ),
+    }
+
+
+class Player:
+    def __init__(self, position):
+        self.position = Vector2(position)
+        self.previous_position = Vector2(position)
+        self.radius = PLAYER_RADIUS
+        self.color = PLAYER_COLOR
+        self.base_speed = PLAYER_SPEED
+        self.speed = PLAYER_SPEED
+        self.base_cooldown = FIRE_COOLDOWN
+        self.cooldown = FIRE_COOLDOWN
+        self.next_shot_time = 0
+        self.base_bullet_radius = BULLET_BASE_RADIUS
+        self.bullet_radius = BULLET_BASE_RADIUS
+        self.base_bullet_damage = BULLET_DAMAGE
+        self.bullet_damage = BULLET_DAMAGE
+        self.shot_count = 1
+        self.power_timers = {}
+        self.permanent_upgrades = {
+            "fire_rate": 0,
+            "damage": 0,
+        }
+        self.invulnerable_until = 0
+        self.hit_flash_end = 0
+        self.piercing_active = False
+
+    def update(self, dt, move):
+        direction = Vector2(move)
+        if direction.length_squared() > 1:
+            direction = direction.normalize()
+        self.position += direction * self.speed * dt
+        self.position.x = max(
+            self.radius, min(WIDTH - self.radius, self.position.x)
+        )
+        self.position.y = max(
+            self.radius, min(HEIGHT - self.radius, self.position.y)
+        )
+
+    def update_powerups(self, now):
+        expired = [
+            name
+            for name, end in self.power_timers.items()
+            if now >= end
+        ]
+        for name in expired:
+            if name == "speed":
+                self.speed = self.base_speed
+            elif name == "fire_rate":
+                self.cooldown = self.base_cooldown
+            elif name == "big_bullet":
+                self.bullet_radius = self.base_bullet_radius
+                self.bullet_damage = self.base_bullet_damage
+            elif name == "multi_shot":
+                self.shot_count = 1
+            elif name == "piercing":
+                self.piercing_active = False
+            del self.power_timers[name]
+
+    def apply_powerup(self, name, now):
+        if name == "speed":
+            self.speed = self.base_speed * SPEED_MULTIPLIER
+            self.power_timers[name] = now + POWERUP_DURATION
+        elif name == "fire_rate":
+            self.cooldown = self.base_cooldown * FIRE_RATE_MULTIPLIER
+            self.power_timers[name] = now + POWERUP_DURATION
+        elif name == "big_bullet":
+            self.bullet_radius = int(
+                self.base_bullet_radius * BULLET_BIG_MULTIPLIER
+            )
+            self.bullet_damage = self.base_bullet_damage + BIG_BULLET_BONUS
+            self.power_timers[name] = now + POWERUP_DURATION
+        elif name == "multi_shot":
+            self.shot_count = MULTI_SHOT_COUNT
+            self.power_timers[name] = now + POWERUP_DURATION
+        elif name == "piercing":
+            self.piercing_active = True
+            self.power_timers[name] = now + POWERUP_DURATION
+        elif name == "perma_fire_rate":
+            self.permanent_upgrades["fire_rate"] += 1
+            self.base_cooldown *= PERMA_FIRE_RATE_MULTIPLIER
+            self.cooldown = self.base_cooldown
+        elif name == "perma_damage":
+            self.permanent_upgrades["damage"] += 1
+            self.base_bullet_damage += PERMA_DAMAGE_BONUS
+            if "big_bullet" in self.power_timers:
+                self.bullet_damage = (
+                    self.base_bullet_damage + BIG_BULLET_BONUS
+                )
+            else:
+                self.bullet_damage = self.base_bullet_damage
+
+
+class Bullet(ProjectileView):
+    __slots__ = ()
+    color = BULLET_COLOR
+
+
+class EnemyProjectile(ProjectileView):
+    __slots__ = ("color",)
+
+    def reset(self, store):
+        super().reset(store)
+        self.color = None
+
+
+class Enemy(EnemyView):
+    def __init__(
+        self,
+        store,
+        position,
+        speed,
+        color,
+        health,
+        radius,
+        name,
+        score_value,
+        reward_value=0,
+        is_boss=False,
+        ranged=False,
+        fire_interval=0,
+        projectile_speed=0,
+        projectile_damage=0,
+        projectile_color=(255, 160, 90),
+        random_move=False,
+        special_shot_interval=0,
+        special_shot_speed=0,
+        special_shot_damage=0,
+        special_shot_hp=0,
+        special_shot_radius=12,
+        special_projectile_color=(255, 205, 140),
+    ):
+        super().__init__(store)
+        store.allocate(self)
+        self.position = position
+        store.previous[self.index] = store.position[self.index]
+        self.speed = speed
+        self.color = color
+        self.health = health
+        self.max_health = health
+        self.radius = radius
+        self.name = name
+        self.score_value = score_value
+        self.coin_value = reward_value
+        self.is_boss = is_boss or name == "boss"
+        self.ranged = ranged
+        self.fire_interval = fire_interval
+        self.projectile_speed = projectile_speed
+        self.projectile_damage = projectile_damage
+        self.projectile_color = projectile_color
+        self.next_shot_time = 0
+        self.special_handle = -1
+        self.random_move = random_move
+        self.special_shot_interval = special_shot_interval
+        self.special_shot_speed = special_shot_speed
+        self.special_shot_damage = special_shot_damage
+        self.special_shot_hp = special_shot_hp
+        self.special_shot_radius = special_shot_radius
+        self.special_projectile_color = special_projectile_color
+        self.next_special_shot_time = 0
+
+    @property
+    def position(self):
+        x, y = self.store.position[self.index]
+        return Vector2(x, y)
+
+    @position.setter
+    def position(self, value):
+        self.store.position[self.index] = (value[0], value[1])
+
+    def try_shoot(self, now, target, projectiles):
+        if not self.ranged or now < self.next_shot_time:
+            return None
+        position = self.store.position[self.index]
+        dx = target[0] - position[0]
+        dy = target[1] - position[1]
+        length_squared = dx * dx + dy * dy
+        if length_squared == 0:
+            return None
+        length = math.sqrt(length_squared)
+        speed = self.projectile_speed
+        self.next_shot_time = now + self.fire_interval
+        projectile = projectiles.spawn(
+            position,
+            (dx / length * speed, dy / length * speed),
+            ENEMY_PROJECTILE_RADIUS,
+            self.projectile_damage,
+        )
+        projectile.color = self.projectile_color
+        return projectile
+
+    def take_damage(self, amount):
+        self.health -= amount
+        return self.health <= 0
+
+
+class PowerUp:
+    def __init__(self, name, position):
+        self.name = name
+        self.position = Vector2(position)
+        self.size = POWERUP_SIZE
+        self.radius = POWERUP_SIZE / 2
+
+
+def _squared_distances(store, x, y):
+    count = store.count
+    offset = store.position[:count] - (x, y)
+    distance = (offset * offset).sum(axis=1)
+    distance[~store.alive[:count]] = np.inf
+    return distance
+
+
+def target_nearest(game, count):
+    """Aim at the closest enemies."""
+    enemies = game.enemies
+    distance = _squared_distances(enemies, *game.player.position)
+    rows = smallest_rows(distance, min(count, len(enemies)))
+    return enemies.position[rows].tolist()
+
+
+def target_lowest_health(game, count):
+    """Aim at the weakest enemies, nearest first among equals."""
+    enemies = game.enemies
+    distance = _squared_distances(enemies, *game.player.position)
+    health = enemies.health[: enemies.count].astype(np.float64)
+    health[np.isinf(distance)] = np.inf
+    rows = smallest_rows(health, min(count, len(enemies)), tiebreak=distance)
+    return enemies.position[rows].tolist()
+
+
+def target_boss_first(game, count):
+    """Aim at the boss, then the closest enemies."""
+    enemies = game.enemies
+    distance = _squared_distances(enemies, *game.player.position)
+    if game.active_boss in enemies:
+        distance[game.active_boss.index] = -1.0
+    rows = smallest_rows(distance, min(count, len(enemies)))
+    return enemies.position[rows].tolist()
+
+
+def target_homing_core_first(game, count):
+    """Aim at the closest homing cores, then the closest enemies."""
+    projectiles = game.enemy_projectiles
+    distance = _squared_distances(projectiles, *game.player.position)
+    cores = (projectiles.flags[: projectiles.count] & HOMING).astype(bool)
+    distance[~cores] = np.inf
+    available = int(np.count_nonzero(np.isfinite(distance)))
+    rows = smallest_rows(distance, min(count, available))
+    targets = projectiles.position[rows].tolist()
+    return targets + target_nearest(game, count - len(targets))
+
+
+TARGETING_POLICIES = {
+    "nearest": target_nearest,
+    "lowest_health": target_lowest_health,
+    "boss_first": target_boss_first,
+    "homing_core_first": target_homing_core_first,
+}
+
+
+class GameCore:
+    """The rules: runs, floors, entities, collisions and meta progression.
+
+    Nothing here touches a window, mixer or font. The core steps on
+    ``clock`` (a StepClock by default) and reads ``input_source``
+    (IdleInput by default), so bots and batch workers run it far faster
+    than real time. Sound cues are reported by name through
+    ``play_sound``, which the presentation layer turns into audio.
+    """
+
+    # Nothing renders, so skip the per-tick snapshots used to interpolate.
+    headless = True
+
+    def __init__(self, tick_rate=TICK_RATE, clock=None, input_source=None):
+        self.tick_rate = tick_rate
+        self.tick_dt = 1.0 / tick_rate
+        self.profiler = Profiler()
+        if clock is None:
+            clock = StepClock(self.tick_dt)
+        if input_source is None:
+            input_source = IdleInput()
+        self.clock = clock
+        self.input_source = input_source
+        self.run_seed = None
+        self.rng = random.Random()
+        self.state = "menu"
+        self.player = None
+        self.bullets = ProjectileStore(Bullet, BULLET_POOL_CAPACITY)
+        self.enemies = EnemyStore(Enemy)
+        self.enemy_projectiles = ProjectileStore(
+            EnemyProjectile,
+            ENEMY_PROJECTILE_POOL_CAPACITY,
+        )
+        self.pool_tier_peaks = {}
+        self.powerups = []
+        self.enemy_grid = SpatialGrid(COLLISION_CELL_SIZE)
+        self.projectile_grid = SpatialGrid(COLLISION_CELL_SIZE)
+        self.powerup_grid = SpatialGrid(COLLISION_CELL_SIZE)
+        self.score = 0
+        self.lives = BASE_LIVES
+        self.floor_number = 1
+        self.waiting_for_floor = False
+        self.floor_cleared_time = 0
+        self.accumulator = 0.0
+        self.sim_time = 0.0
+        self.last_powerup_spawn = 0.0
+        self.game_over_time = 0
+        self.floor_started_at = 0.0
+        self.floor_times = []
+        self.death_cause = None
+        self.active_boss = None
+        self.run_currency = 0
+        self.currency = 0
+        self.meta_upgrades = {
+            name: 0 for name in META_UPGRADE_ORDER
+        }
+        self.meta_effects = {}
+        self.state_before_shop = "menu"
+        self.money_multiplier = 1.0
+        self.auto_fire_level = 0
+        self.auto_fire_cooldown = AUTO_FIRE_BASE_COOLDOWN
+        self.auto_fire_shots = 0
+        self.auto_fire_timer = 0.0
+        self.auto_fire_targeting = AUTO_FIRE_TARGETING
+        self.update_meta_effects()
+
+    def update_meta_effects(self):
+        self.meta_effects = meta_effects(self.meta_upgrades)
+        self.money_multiplier = self.meta_effects["money_multiplier"]
+        self.auto_fire_level = self.meta_effects["auto_fire_level"]
+        self.auto_fire_cooldown = self.meta_effects["auto_fire_cooldown"]
+        self.auto_fire_shots = self.meta_effects["auto_fire_shots"]
+        if self.auto_fire_level == 0:
+            self.auto_fire_timer = float("inf")
+
+
+    def max_out_meta_upgrades(self):
+        for name, data in META_UPGRADE_DEFS.items():
+            self.meta_upgrades[name] = data["max_level"]
+        self.update_meta_effects()
+        if self.state == "playing":
+            self.apply_meta_to_player()
+        self.play_sound("power")
+
+    def reset_game(self, seed=None):
+        # Close out a run restarted midway before its state is cleared.
+        self.notify_input("end_run")
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.run_seed = seed
+        self.rng = random.Random(seed)
+        self.player = Player((WIDTH / 2, HEIGHT / 2))
+        self.apply_meta_to_player()
+        self.bullets.clear()
+        self.enemies.clear()
+        self.enemy_projectiles.clear()
+        self.powerups = []
+        self.score = 0
+        self.run_currency = 0
+        self.floor_number = 1
+        self.waiting_for_floor = False
+        self.floor_cleared_time = 0
+        self.sim_time = 0.0
+        self.accumulator = 0.0
+        self.last_powerup_spawn = self.sim_time
+        self.floor_times = []
+        self.death_cause = None
+        self.active_boss = None
+        self.spawn_floor()
+        self.notify_input("start_run")
+
+    def notify_input(self, hook):
+        """Call the input source's optional start_run/end_run hook."""
+        callback = getattr(self.input_source, hook, None)
+        if callback is not None:
+            callback(self)
+
+    def apply_meta_to_player(self):
+        if self.player is None:
+            return
+        stats = self.meta_effects
+        self.player.base_speed = PLAYER_SPEED * stats["speed_multiplier"]
+        self.player.speed = self.player.base_speed
+        self.player.base_cooldown = FIRE_COOLDOWN * (
+            stats["fire_rate_multiplier"]
+        )
+        self.player.cooldown = self.player.base_cooldown
+        self.player.base_bullet_damage = BULLET_DAMAGE + (
+            stats["damage_bonus"]
+        )
+        self.player.bullet_damage = self.player.base_bullet_damage
+        self.player.base_bullet_radius = BULLET_BASE_RADIUS
+        self.player.bullet_radius = BULLET_BASE_RADIUS
+        self.player.shot_count = 1
+        self.player.power_timers.clear()
+        self.player.permanent_upgrades = {
+            "fire_rate": 0,
+            "damage": 0,
+        }
+        self.lives = stats["starting_lives"]
+        if stats["auto_fire_level"]:
+            self.auto_fire_timer = self.auto_fire_cooldown
+        else:
+            self.auto_fire_timer = float("inf")
+    def spawn_floor(self):
+        if self.player is None:
+            return
+        self.enemies.clear()
+        self.enemy_projectiles.clear()
+        self.floor_started_at = self.sim_time
+        if self.floor_number % BOSS_FLOOR_INTERVAL == 0:
+            self.active_boss = self.create_boss()
+            return
+        self.active_boss = None
+        count = floor_enemy_count(self.floor_number)
+        for _ in range(count):
+            self.create_enemy()
+
+    def create_enemy(self):
+        margin = ENEMY_SPAWN_MARGIN
+        while True:
+            side = self.rng.choice(("top", "bottom", "left", "right"))
+            if side == "top":
+                x = self.rng.uniform(0, WIDTH)
+                y = -margin
+            elif side == "bottom":
+                x = self.rng.uniform(0, WIDTH)
+                y = HEIGHT + margin
+            elif side == "left":
+                x = -margin
+                y = self.rng.uniform(0, HEIGHT)
+            else:
+                x = WIDTH + margin
+                y = self.rng.uniform(0, HEIGHT)
+            position = Vector2(x, y)
+            if (
+                self.player
+                and (position - self.player.position).length() > 180
+            ):
+                break
+        variant = self.rng.choice(enemy_variant_pool(self.floor_number))
+        speed, base_health = enemy_stats(variant, self.floor_number)
+        return Enemy(
+            self.enemies,
+            position,
+            speed,
+            variant["color"],
+            base_health,
+            variant["radius"],
+            variant["name"],
+            variant["score"],
+            reward_value=variant.get("reward", 2),
+            ranged=variant.get("ranged", False),
+            fire_interval=variant.get("fire_interval", 0),
+            projectile_speed=variant.get("projectile_speed", 0),
+            projectile_damage=variant.get("projectile_damage", 0),
+            projectile_color=variant.get("projectile_color", (255, 160, 90)),
+            random_move=variant.get("random_move", False),
+        )
+
+
+    def create_boss(self):
+        margin = ENEMY_SPAWN_MARGIN + 60
+        while True:
+            x = self.rng.uniform(margin, WIDTH - margin)
+            y = self.rng.uniform(margin, HEIGHT - margin)
+            position = Vector2(x, y)
+            if (position - self.player.position).length() > 260:
+                break
+        stats = boss_stats(self.floor_number)
+        health = stats.pop("health")
+        speed = stats.pop("speed")
+        enemy = Enemy(
+            self.enemies,
+            position,
+            speed,
+            BOSS_COLOR,
+            health,
+            BOSS_RADIUS,
+            "boss",
+            BOSS_SCORE_VALUE,
+            reward_value=0,
+            is_boss=True,
+            ranged=True,
+            projectile_color=(255, 120, 180),
+            **stats,
+        )
+        enemy.next_shot_time = 0
+        enemy.next_special_shot_time = 0
+        return enemy
+
+
+    def spawn_powerup(self):
+        margin = 80
+        x = self.rng.uniform(margin, WIDTH - margin)
+        y = self.rng.uniform(margin, HEIGHT - margin)
+        names = list(NORMAL_POWERUPS)
+        weights = [POWERUP_WEIGHTS[name] for name in names]
+        name = self.rng.choices(names, weights=weights, k=1)[0]
+        position = Vector2(x, y)
+        if self.player and (position - self.player.position).length() < 120:
+            position += Vector2(140, 0)
+            position.x = min(max(position.x, margin), WIDTH - margin)
+            position.y = min(max(position.y, margin), HEIGHT - margin)
+        self.powerups.append(PowerUp(name, position))
+
+    def reward_currency(self, base_amount):
+        amount = int(round(base_amount * self.money_multiplier))
+        if amount <= 0:
+            return
+        self.run_currency += amount
+        self.currency += amount
+
+    def floor_clear_reward(self):
+        return floor_clear_reward(self.floor_number)
+
+    def handle_boss_drop(self, position):
+        self.reward_currency(boss_reward(self.floor_number))
+        offsets = [
+            Vector2(
+                self.rng.uniform(-50, 50),
+                self.rng.uniform(-50, 50),
+            )
+            for _ in SESSION_POWERUPS
+        ]
+        for offset, name in zip(offsets, SESSION_POWERUPS):
+            drop_pos = position + offset
+            drop_pos.x = max(60, min(WIDTH - 60, drop_pos.x))
+            drop_pos.y = max(60, min(HEIGHT - 60, drop_pos.y))
+            self.powerups.append(PowerUp(name, drop_pos))
+    def fire_bullet(self, direction):
+        dx, dy = direction
+        length_squared = dx * dx + dy * dy
+        if length_squared > 0:
+            length = math.sqrt(length_squared)
+            velocity = (dx / length * BULLET_SPEED, dy / length * BULLET_SPEED)
+        else:
+            velocity = (0.0, 0.0)
+        return self.bullets.spawn(
+            self.player.position,
+            velocity,
+            self.player.bullet_radius,
+            self.player.bullet_damage,
+            flags=PIERCING if self.player.piercing_active else 0,
+        )
+
+    def handle_shooting(self, now, controls):
+        if self.player is None:
+            return
+        if not controls.fire:
+            return
+        if now < self.player.next_shot_time:
+            return
+        target = Vector2(controls.aim)
+        direction = target - self.player.position
+        if direction.length_squared() == 0:
+            return
+        base_direction = direction.normalize()
+        shot_count = self.player.shot_count
+        bullets_to_add = []
+        if shot_count == 1:
+            bullets_to_add.append(base_direction)
+        else:
+            spread_half = (shot_count - 1) / 2
+            for index in range(shot_count):
+                offset = index - spread_half
+                angle = offset * BULLET_SPREAD_ANGLE
+                bullets_to_add.append(base_direction.rotate(angle))
+        for shot_dir in bullets_to_add:
+            self.fire_bullet(shot_dir)
+        self.player.next_shot_time = now + int(self.player.cooldown * 1000)
+        self.play_sound("fire")
+
+    def handle_auto_fire(self, dt):
+        if self.player is None or self.auto_fire_level == 0:
+            return
+        if not self.enemies:
+            self.auto_fire_timer = min(
+                self.auto_fire_timer + dt,
+                self.auto_fire_cooldown,
+            )
+            return
+        self.auto_fire_timer -= dt
+        if self.auto_fire_timer > 0:
+            return
+        policy = TARGETING_POLICIES[self.auto_fire_targeting]
+        player_x, player_y = self.player.position
+        fired = False
+        for target_x, target_y in policy(self, self.auto_fire_shots):
+            direction = (target_x - player_x, target_y - player_y)
+            if direction == (0, 0):
+                continue
+            self.fire_bullet(direction)
+            fired = True
+        if fired:
+            self.play_sound("fire")
+        self.auto_fire_timer = self.auto_fire_cooldown
+
+    def rebuild_collision_grids(self):
+        # Only bullets query these grids, so skip the rebuild when none fly.
+        if not self.bullets.count:
+            return
+        for grid, store in (
+            (self.enemy_grid, self.enemies),
+            (self.projectile_grid, self.enemy_projectiles),
+        ):
+            count = store.count
+            grid.rebuild_from(
+                store.views,
+                store.position[:count],
+                store.radius[:count],
+            )
+
+    def update_enemies(self, dt, now):
+        if self.player is None:
+            return
+        enemies = self.enemies
+        player_x, player_y = self.player.position
+        enemies.steer(player_x, player_y, dt, WIDTH, HEIGHT, self.rng)
+        count = enemies.count
+        alive = enemies.alive[:count]
+        # This loop visits every enemy anyway, so test contact inline.
+        positions = enemies.position[:count].tolist()
+        radii = enemies.radius[:count].tolist()
+        player_radius = self.player.radius
+        for index in np.flatnonzero(alive).tolist():
+            enemy = enemies.views[index]
+            enemy.try_shoot(now, self.player.position, self.enemy_projectiles)
+            if enemy.special_shot_interval > 0:
+                active_special = self.enemy_projectiles.is_alive(
+                    enemy.special_handle
+                )
+                if (
+                    not active_special
+                    and now >= enemy.next_special_shot_time
+                ):
+                    direction = self.player.position - enemy.position
+                    if direction.length_squared() == 0:
+                        direction = Vector2(1, 0)
+                    else:
+                        direction = direction.normalize()
+                    special_projectile = self.enemy_projectiles.spawn(
+                        enemy.position,
+                        direction * enemy.special_shot_speed,
+                        enemy.special_shot_radius,
+                        enemy.special_shot_damage,
+                        flags=DESTROYABLE | HOMING,
+                        hit_points=enemy.special_shot_hp,
+                        speed=enemy.special_shot_speed,
+                        owner=enemy.handle,
+                    )
+                    special_projectile.color = enemy.special_projectile_color
+                    enemy.special_handle = special_projectile.handle
+                    enemy.next_special_shot_time = now + enemy.special_shot_interval
+            x, y = positions[index]
+            dx = x - player_x
+            dy = y - player_y
+            reach = radii[index] + player_radius
+            if dx * dx + dy * dy <= reach * reach:
+                collision_damage = 2 if enemy.is_boss else 1
+                took_damage = self.handle_player_hit(
+                    enemy, now, collision_damage
+                )
+                if took_damage:
+                    if enemy.is_boss:
+                        offset = enemy.position - self.player.position
+                        if offset.length_squared() > 0:
+                            offset = offset.normalize() * (
+                                enemy.radius + self.player.radius + 12
+                            )
+                            enemy.position = self.player.position + offset
+                    else:
+                        enemies.remove(enemy)
+                if self.state == "game_over":
+                    break
+
+    def update_bullets(self, dt):
+        bullets = self.bullets
+        if not bullets.count:
+            return
+        enemies = self.enemies
+        projectiles = self.enemy_projectiles
+        enemy_grid = self.enemy_grid
+        projectile_grid = self.projectile_grid
+        bullets.advance(dt)
+        count = bullets.count
+        xs = bullets.position[:count, 0].tolist()
+        ys = bullets.position[:count, 1].tolist()
+        radii = bullets.radius[:count].tolist()
+        damages = bullets.damage[:count].tolist()
+        piercing = (bullets.flags[:count] & PIERCING).tolist()
+        enemy_xs = enemies.position[: enemies.count, 0].tolist()
+        enemy_ys = enemies.position[: enemies.count, 1].tolist()
+        enemy_radii = enemies.radius[: enemies.count].tolist()
+        for index in range(count):
+            x = xs[index]
+            y = ys[index]
+            radius = radii[index]
+            damage = damages[index]
+            removed = False
+            for enemy in enemy_grid.query(x, y, radius):
+                row = enemy.index
+                if circles_overlap(
+                    x,
+                    y,
+                    radius,
+                    enemy_xs[row],
+                    enemy_ys[row],
+                    enemy_radii[row],
+                ):
+                    killed = enemy.take_damage(damage)
+                    self.play_sound("hit")
+                    if killed:
+                        if enemy.coin_value:
+                            self.reward_currency(enemy.coin_value)
+                        enemies.remove(enemy)
+                        enemy_grid.remove(enemy)
+                        self.score += enemy.score_value
+                        if enemy is self.active_boss:
+                            special = projectiles.get(enemy.special_handle)
+                            if special is not None:
+                                projectiles.remove(special)
+                                projectile_grid.remove(special)
+                            enemy.special_handle = -1
+                            self.active_boss = None
+                            self.handle_boss_drop(enemy.position)
+                    if not piercing[index]:
+                        removed = True
+                    break
+            if removed:
+                bullets.kill(index)
+                continue
+            for projectile in projectile_grid.query(x, y, radius):
+                px, py = projectile.position
+                if circles_overlap(x, y, radius, px, py, projectile.radius):
+                    remove_bullet = True
+                    if projectile.destroyable:
+                        projectile.hit_points -= damage
+                        if projectile.hit_points <= 0 and projectile in projectiles:
+                            self.discard_enemy_projectile(projectile)
+                            projectile_grid.remove(projectile)
+                        if piercing[index]:
+                            remove_bullet = False
+                    elif piercing[index]:
+                        remove_bullet = False
+                    removed = remove_bullet
+                    break
+            if (
+                removed
+                or x < -radius
+                or x > WIDTH + radius
+                or y < -radius
+                or y > HEIGHT + radius
+            ):
+                bullets.kill(index)
+
+
+    def pool_stats(self):
+        return {
+            "bullets": self.bullets.pool.stats(),
+            "enemy_projectiles": self.enemy_projectiles.pool.stats(),
+        }
+
+    def record_pool_peaks(self):
+        """Fold this floor's pool high-water marks into its floor tier."""
+        tier = (self.floor_number - 1) // POOL_TIER_FLOORS
+        peaks = self.pool_tier_peaks.setdefault(
+            tier,
+            {"bullets": 0, "enemy_projectiles": 0},
+        )
+        for name, store in (
+            ("bullets", self.bullets),
+            ("enemy_projectiles", self.enemy_projectiles),
+        ):
+            peaks[name] = max(peaks[name], store.pool.high_water)
+            store.pool.reset_peak()
+
+    def handle_player_hit(self, source, now, damage=1):
+        if self.player is None:
+            return False
+        if now < self.player.invulnerable_until:
+            return False
+        self.lives -= damage
+        self.player.invulnerable_until = now + INVULNERABILITY_DURATION
+        self.player.hit_flash_end = now + HIT_FLASH_DURATION
+        self.play_sound("damage")
+        if self.lives <= 0:
+            self.state = "game_over"
+            self.game_over_time = now
+            self.death_cause = self.hit_cause(source)
+            self.notify_input("end_run")
+            # The floor a run dies on is usually its busiest.
+            self.record_pool_peaks()
+            self.bullets.clear()
+            self.enemy_projectiles.clear()
+        return True
+
+
+    def hit_cause(self, source):
+        if isinstance(source, Enemy):
+            return source.name
+        return "homing core" if source.homing else "enemy shot"
+
+    def discard_enemy_projectile(self, projectile):
+        owner = self.enemies.get(projectile.owner)
+        if owner is not None and owner.special_handle == projectile.handle:
+            owner.special_handle = -1
+        projectile.owner = -1
+        self.enemy_projectiles.remove(projectile)
+
+    def update_enemy_projectiles(self, dt, now):
+        if self.player is None:
+            return
+        projectiles = self.enemy_projectiles
+        views = projectiles.views
+        count = projectiles.count
+        if not count:
+            return
+        # Only homing special shots carry an owner.
+        if projectiles.homing:
+            owners = projectiles.owner[:count]
+            for index in np.flatnonzero(owners >= 0).tolist():
+                if not self.enemies.is_alive(int(owners[index])):
+                    owners[index] = -1
+        projectiles.steer_homing(self.player.position.x, self.player.position.y)
+        projectiles.advance(dt)
+        offset = projectiles.position[:count] - (
+            self.player.position.x,
+            self.player.position.y,
+        )
+        reach = projectiles.radius[:count] + self.player.radius
+        touching = (offset * offset).sum(axis=1) <= reach * reach
+        touching &= projectiles.alive[:count]
+        for index in np.flatnonzero(touching).tolist():
+            projectile = views[index]
+            took_damage = self.handle_player_hit(
+                projectile, now, projectile.damage
+            )
+            if self.state == "game_over":
+                return
+            if projectile.destroyable or took_damage:
+                self.discard_enemy_projectile(projectile)
+        spent = (
+            (projectiles.flags[:count] & DESTROYABLE).astype(bool)
+            & (projectiles.hit_points[:count] <= 0)
+        )
+        spent |= projectiles.offscreen_mask(WIDTH, HEIGHT)
+        spent &= ~touching & projectiles.alive[:count]
+        for index in np.flatnonzero(spent).tolist():
+            self.discard_enemy_projectile(views[index])
+
+
+    def handle_powerups(self, now):
+        if self.player is None:
+            return
+        if (
+            now - self.last_powerup_spawn >= POWERUP_INTERVAL
+            and not self.powerups
+        ):
+            self.spawn_powerup()
+            self.last_powerup_spawn = now
+        if not self.powerups:
+            return
+        self.powerup_grid.rebuild(self.powerups)
+        for powerup in self.powerup_grid.query(
+            self.player.position.x,
+            self.player.position.y,
+            self.player.radius,
+        ):
+            if circle_collision(
+                self.player.position,
+                self.player.radius,
+                powerup.position,
+                powerup.radius,
+            ):
+                self.powerups.remove(powerup)
+                self.player.apply_powerup(powerup.name, now)
+                self.play_sound("power")
+
+    def update_floors(self, now):
+        if self.state != "playing":
+            return
+        if not self.enemies and not self.waiting_for_floor:
+            self.waiting_for_floor = True
+            self.floor_cleared_time = now
+            self.floor_times.append(now - self.floor_started_at)
+            self.reward_currency(self.floor_clear_reward())
+        if (
+            self.waiting_for_floor
+            and now - self.floor_cleared_time >= FLOOR_DELAY
+        ):
+            self.record_pool_peaks()
+            self.floor_number += 1
+            self.spawn_floor()
+            self.waiting_for_floor = False
+
+    def update_gameplay(self, dt):
+        if self.player is None:
+            return
+        prof = self.profiler
+        if not self.headless:
+            self.player.previous_position = Vector2(self.player.position)
+            self.bullets.snapshot()
+            self.enemies.snapshot()
+            self.enemy_projectiles.snapshot()
+        self.sim_time += dt * 1000
+        now = self.sim_time
+        with prof.phase("player"):
+            controls = self.input_source.poll(self)
+            self.player.update(dt, controls.move)
+            self.player.update_powerups(now)
+        with prof.phase("shooting"):
+            self.handle_shooting(now, controls)
+            self.handle_auto_fire(dt)
+        with prof.phase("collision_grids"):
+            self.rebuild_collision_grids()
+        with prof.phase("update_bullets"):
+            self.update_bullets(dt)
+        with prof.phase("update_enemies"):
+            self.update_enemies(dt, now)
+        if self.state != "game_over":
+            with prof.phase("update_enemy_projectiles"):
+                self.update_enemy_projectiles(dt, now)
+            with prof.phase("powerups_floors"):
+                self.handle_powerups(now)
+                self.update_floors(now)
+        with prof.phase("flush_removals"):
+            self.flush_removals()
+        if prof.enabled:
+            for name, stats in self.pool_stats().items():
+                prof.count(f"{name}_in_use", stats["in_use"])
+                prof.count(f"{name}_peak", stats["high_water"])
+
+    def flush_removals(self):
+        self.bullets.flush()
+        self.enemies.flush()
+        self.enemy_projectiles.flush()
+
+    def advance_simulation(self, frame_dt):
+        """Run as many fixed ticks as the elapsed frame time covers.
+
+        When rendering falls far behind, at most MAX_CATCH_UP_TICKS run and
+        the rest of the backlog is dropped so the game slows down instead of
+        spiralling.
+        """
+        self.accumulator += frame_dt
+        ticks = 0
+        while self.accumulator >= self.tick_dt:
+            if ticks == MAX_CATCH_UP_TICKS:
+                self.accumulator = 0.0
+                break
+            self.update_gameplay(self.tick_dt)
+            self.accumulator -= self.tick_dt
+            ticks += 1
+            if self.state != "playing":
+                self.accumulator = 0.0
+                break
+            if getattr(self.input_source, "finished", False):
+                self.pause()
+                self.accumulator = 0.0
+                break
+
+    def pause(self):
+        self.state = "paused"
+
+    def play_sound(self, name):
+        """Report a sound cue ("fire", "hit", "power" or "damage"); silent here."""
+
+    def start_run(self, seed=None):
+        self.reset_game(seed)
+        self.state = "playing"
+
+    def run_headless(self, max_ticks):
+        """Play until the run ends or ``max_ticks`` ticks; return ticks run."""
+        ticks = 0
+        while self.state == "playing" and ticks < max_ticks:
+            self.accumulator += self.clock.tick()
+            while self.accumulator >= self.tick_dt and ticks < max_ticks:
+                self.update_gameplay(self.tick_dt)
+                self.accumulator -= self.tick_dt
+                ticks += 1
+                if self.state != "playing":
+                    break
+        return ticks
+
+    def meta_upgrade_cost(self, name):
+        level = self.meta_upgrades[name]
+        data = META_UPGRADE_DEFS[name]
+        if level >= data["max_level"]:
+            return 0
+        cost = data["base_cost"] * (data["cost_scale"] ** level)
+        return int(round(cost))
+
+    def buy_meta_upgrade(self, name):
+        data = META_UPGRADE_DEFS[name]
+        level = self.meta_upgrades[name]
+        if level >= data["max_level"]:
+            return False
+        cost = self.meta_upgrade_cost(name)
+        if self.currency < cost:
+            return False
+        self.currency -= cost
+        self.meta_upgrades[name] += 1
+        self.update_meta_effects()
+        self.play_sound("power")
+        if self.state == "playing":
+            self.apply_meta_to_player()
+        return True
@@ -0,0 +1,207 @@
+"""Batched Monte Carlo estimate of floor survival and coin income.
+
+Instead of playing frames, every floor is resolved in one step for all runs
+at once: each run is a row in a set of NumPy arrays, and the whole batch
+advances one floor per iteration. Floor composition, enemy and boss stats,
+rewards and workshop effects come from the same functions the game uses
+(``enemy_variant_pool``, ``enemy_stats``, ``boss_stats``,
+``floor_clear_reward``, ``meta_effects``), so balance edits show up here
+without changes. Player skill is reduced to the hit-rate and hazard
+constants below, which were tuned so that floor reached and coins land
+near ``bots.py --policy kite`` batches with no workshop upgrades, with
+``damage=3,auto_fire=2`` and with ``--max-meta``; recalibrate them the
+same way.
+
+    python montecarlo.py --runs 200000 --meta max
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from core import (
+    BOSS_FLOOR_INTERVAL,
+    BULLET_DAMAGE,
+    ENEMY_BASE_SPEED,
+    FIRE_COOLDOWN,
+    FLOOR_DELAY,
+    INVULNERABILITY_DURATION,
+    META_UPGRADE_DEFS,
+    META_UPGRADE_ORDER,
+    PERMA_DAMAGE_BONUS,
+    PERMA_FIRE_RATE_MULTIPLIER,
+    boss_reward,
+    boss_stats,
+    enemy_stats,
+    enemy_variant_pool,
+    floor_clear_reward,
+    floor_enemy_count,
+    meta_effects,
+)
+
+MANUAL_ACCURACY = 0.31
+AUTO_ACCURACY = 0.91
+ENGAGE_SECONDS = 2.0
+CONTACT_HAZARD = 0.0052
+SHOT_HAZARD = 0.024
+BOSS_CONTACT_HAZARD = 0.33
+BOSS_SHOT_HAZARD = 0.108
+CORE_HAZARD = 0.024
+MAX_FLOORS = 500
+
+
+class MonteCarloResult:
+    """Per-run outcomes plus per-floor curves for a batch.
+
+    ``survival[f]`` is the fraction of runs that started floor ``f + 1``;
+    ``income[f]`` is the mean run coins of those that cleared it.
+    """
+
+    def __init__(self, floors, coins, seconds, survival, income):
+        self.floors = floors
+        self.coins = coins
+        self.seconds = seconds
+        self.survival = survival
+        self.income = income
+
+    def floor_percentiles(self, percentiles=(10, 50, 90)):
+        return dict(zip(percentiles, np.percentile(self.floors, percentiles).tolist()))
+
+
+def _floor_table(floor_number):
+    """Per-variant arrays for a regular floor: health, reward, hazard."""
+    pool = enemy_variant_pool(floor_number)
+    health = []
+    reward = []
+    hazard = []
+    for variant in pool:
+        speed, hp = enemy_stats(variant, floor_number)
+        health.append(hp)
+        reward.append(variant.get("reward", 2))
+        danger = CONTACT_HAZARD * speed / ENEMY_BASE_SPEED
+        if variant.get("ranged"):
+            danger += SHOT_HAZARD * 1000 / variant["fire_interval"]
+        hazard.append(danger)
+    return np.array(health), np.array(reward), np.array(hazard)
+
+
+def simulate(runs, upgrades=None, max_floors=MAX_FLOORS, seed=None):
+    """Advance ``runs`` simplified runs in lock-step until all have died."""
+    upgrades = upgrades or {name: 0 for name in META_UPGRADE_ORDER}
+    effects = meta_effects(upgrades)
+    rng = np.random.default_rng(seed)
+    money = effects["money_multiplier"]
+    auto_rate = 0.0
+    if effects["auto_fire_shots"]:
+        auto_rate = effects["auto_fire_shots"] * AUTO_ACCURACY / effects["auto_fire_cooldown"]
+    invulnerable = INVULNERABILITY_DURATION / 1000
+
+    lives = np.full(runs, effects["starting_lives"], dtype=np.int64)
+    damage = np.full(runs, BULLET_DAMAGE + effects["damage_bonus"], dtype=np.int64)
+    cooldown = np.full(runs, FIRE_COOLDOWN * effects["fire_rate_multiplier"])
+    coins = np.zeros(runs, dtype=np.int64)
+    seconds = np.zeros(runs)
+    floors = np.full(runs, max_floors, dtype=np.int64)
+    alive = np.ones(runs, dtype=bool)
+    survival = []
+    income = []
+
+    for floor_number in range(1, max_floors + 1):
+        rows = np.flatnonzero(alive)
+        survival.append(rows.size / runs)
+        if rows.size == 0:
+            break
+        size = rows.size
+        row_damage = damage[rows]
+        hit_rate = MANUAL_ACCURACY / cooldown[rows] + auto_rate
+        if floor_number % BOSS_FLOOR_INTERVAL == 0:
+            stats = boss_stats(floor_number)
+            hits = -(-stats["health"] // row_damage)
+            kill_coins = np.zeros(size, dtype=np.int64)
+            danger = (
+                BOSS_CONTACT_HAZARD * 2
+                + BOSS_SHOT_HAZARD * 1000 / stats["fire_interval"] * stats["projectile_damage"]
+                + CORE_HAZARD * 1000 / stats["special_shot_interval"] * stats["special_shot_damage"]
+            )
+            per_hit = 2.0
+            danger = np.full(size, danger)
+        else:
+            health, reward, hazard = _floor_table(floor_number)
+            count = floor_enemy_count(floor_number)
+            mix = rng.multinomial(count, np.full(len(health), 1.0 / len(health)), size=size)
+            needed = -(-health[None, :] // row_damage[:, None])
+            hits = (mix * needed).sum(axis=1)
+            rounded = np.rint(reward * money).astype(np.int64)
+            kill_coins = mix @ rounded
+            danger = mix @ hazard
+            per_hit = 1.0
+        duration = rng.gamma(hits, 1.0 / hit_rate) + ENGAGE_SECONDS
+        # Enemies thin out as the floor goes on, so exposure is about half.
+        expected = danger * duration * 0.5 / per_hit
+        taken = rng.poisson(expected)
+        cap = np.floor(duration / invulnerable).astype(np.int64) + 1
+        loss = np.ceil(np.minimum(taken, cap) * per_hit).astype(np.int64)
+        row_lives = lives[rows] - loss
+        died = row_lives <= 0
+        lives[rows] = row_lives
+        survived = rows[~died]
+        fallen = rows[died]
+        floors[fallen] = floor_number
+        alive[fallen] = False
+        coins[fallen] += (kill_coins[died] * rng.random(fallen.size)).astype(np.int64)
+        seconds[fallen] += duration[died] * rng.random(fallen.size)
+        clear_bonus = int(round(floor_clear_reward(floor_number) * money))
+        if floor_number % BOSS_FLOOR_INTERVAL == 0:
+            clear_bonus += int(round(boss_reward(floor_number) * money))
+            cooldown[survived] *= PERMA_FIRE_RATE_MULTIPLIER
+            damage[survived] += PERMA_DAMAGE_BONUS
+        coins[survived] += kill_coins[~died] + clear_bonus
+        seconds[survived] += duration[~died] + FLOOR_DELAY / 1000
+        income.append(float(coins[survived].mean()) if survived.size else math.nan)
+
+    return MonteCarloResult(floors, coins, seconds, np.array(survival), np.array(income))
+
+
+def parse_loadout(text):
+    """``max``, ``none`` or ``name=level,...`` into a full upgrade dict."""
+    upgrades = {name: 0 for name in META_UPGRADE_ORDER}
+    if text in (None, "", "none"):
+        return upgrades
+    if text == "max":
+        return {name: data["max_level"] for name, data in META_UPGRADE_DEFS.items()}
+    for item in text.split(","):
+        name, _, level = item.partition("=")
+        name = name.strip()
+        if name not in upgrades:
+            raise ValueError(f"unknown upgrade {name!r}")
+        upgrades[name] = min(int(level), META_UPGRADE_DEFS[name]["max_level"])
+    return upgrades
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo floor-survival estimate")
+    parser.add_argument("--runs", type=int, default=100000)
+    parser.add_argument("--meta", default="none", help="max, none, or e.g. damage=3,fire_rate=2")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-floors", type=int, default=MAX_FLOORS)
+    parser.add_argument("--every", type=int, default=5, help="print every Nth floor")
+    args = parser.parse_args(argv)
+
+    upgrades = parse_loadout(args.meta)
+    started = time.perf_counter()
+    result = simulate(args.runs, upgrades, args.max_floors, args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.runs} runs in {elapsed:.2f}s")
+    print("floor percentiles:", result.floor_percentiles())
+    print(f"mean coins {result.coins.mean():.1f}  mean run {result.seconds.mean():.1f}s")
+    print("floor  reached  coins")
+    for index in range(0, len(result.income), args.every):
+        floor_number = index + 1
+        print(f"{floor_number:5d}  {result.survival[index]:7.1%}  {result.income[index]:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
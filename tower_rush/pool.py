@@ -0,0 +1,51 @@
+"""Recycling pool for short-lived game objects."""
+
+
+class ObjectPool:
+    """Hand out recycled objects instead of allocating fresh ones.
+
+    ``factory`` builds a blank object on a miss. Every acquired object has
+    ``reset(*args)`` called on it, so recycled and new objects start from
+    the same state. At most ``capacity`` released objects are kept around.
+    """
+
+    def __init__(self, factory, capacity=256):
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            self.hits += 1
+        else:
+            obj = self.factory()
+            self.misses += 1
+        obj.reset(*args)
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(obj)
+
+    def reset_peak(self):
+        """Start a new high-water window from the current usage."""
+        self.high_water = self.in_use
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "hits": self.hits,
+            "misses": self.misses,
+            "high_water": self.high_water,
+        }
@@ -0,0 +1,201 @@
+"""Frame profiler: rolling per-phase timings, an overlay and trace export."""
+
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+WINDOW_FRAMES = 240
+OVERLAY_REFRESH_FRAMES = 15
+MAX_TRACE_EVENTS = 1_000_000
+TRACE_DIR = "traces"
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_COLOR = (200, 255, 200)
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.started, time.perf_counter())
+        return False
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class Profiler:
+    """Time named phases while enabled and summarize the last few seconds.
+
+    ``phase(name)`` is a context manager; when the profiler is off it hands
+    back a shared no-op so instrumented code costs next to nothing. While a
+    trace is recording, every phase and counter is also kept as a Chrome
+    trace event for Perfetto / chrome://tracing.
+    """
+
+    def __init__(self, window=WINDOW_FRAMES, trace_dir=TRACE_DIR):
+        self.enabled = False
+        self.window = window
+        self.trace_dir = trace_dir
+        self.samples = {}
+        self.counters = {}
+        self.frame_started = None
+        self.frames = 0
+        self.trace_events = None
+        self.trace_origin = 0.0
+        self.status = ""
+        self.overlay_surface = None
+
+    @property
+    def tracing(self):
+        return self.trace_events is not None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if not self.enabled:
+            self.samples.clear()
+            self.counters.clear()
+            self.overlay_surface = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, started, ended):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append((ended - started) * 1000)
+        events = self.trace_events
+        if events is not None and len(events) < MAX_TRACE_EVENTS:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (started - self.trace_origin) * 1e6,
+                    "dur": (ended - started) * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+
+    def count(self, name, value):
+        """Report a per-frame counter (shown in the overlay and trace)."""
+        if not self.enabled:
+            return
+        self.counters[name] = value
+        events = self.trace_events
+        if events is not None and len(events) < MAX_TRACE_EVENTS:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": (time.perf_counter() - self.trace_origin) * 1e6,
+                    "pid": 1,
+                    "args": {"value": value},
+                }
+            )
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_started = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_started is None:
+            return
+        self.record("frame", self.frame_started, time.perf_counter())
+        self.frame_started = None
+        self.frames += 1
+
+    def percentiles(self, name, percentiles=(50, 95, 99)):
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        return np.percentile(np.fromiter(samples, float, len(samples)), percentiles)
+
+    def start_trace(self):
+        self.enabled = True
+        self.trace_events = []
+        self.trace_origin = self.frame_started or time.perf_counter()
+        self.status = "recording trace"
+
+    def stop_trace(self, path=None):
+        """Write the recorded events as Chrome trace JSON; return the path.
+
+        Without ``path`` the file is named after the current time inside
+        ``trace_dir``, which is created if needed.
+        """
+        if path is None:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            path = os.path.join(self.trace_dir, time.strftime("tower_rush_trace_%Y%m%d_%H%M%S.json"))
+        events = self.trace_events or []
+        self.trace_events = None
+        with open(path, "w") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        self.status = f"trace saved: {os.path.basename(path)}"
+        return path
+
+    def summary_rows(self):
+        rows = []
+        for name in self.samples:
+            rows.append((name,) + tuple(f"{value:.2f}" for value in self.percentiles(name)))
+        for name, value in self.counters.items():
+            rows.append((name, str(value)))
+        return rows
+
+    def draw(self, surface, font):
+        """Blit the overlay and return its rect; text is re-rendered every few frames only."""
+        if not self.enabled:
+            return None
+        if self.overlay_surface is None or self.frames % OVERLAY_REFRESH_FRAMES == 0:
+            # Headless games time phases too; only the overlay needs SDL.
+            import pygame
+
+            rows = [("phase (ms)", "p50", "p95", "p99")] + self.summary_rows()
+            if self.status:
+                rows.append((self.status,))
+            rendered = [[font.render(cell, True, OVERLAY_COLOR) for cell in row] for row in rows]
+            columns = max(len(row) for row in rendered)
+            widths = [
+                max(row[column].get_width() for row in rendered if len(row) > column and len(row) > 1)
+                for column in range(columns)
+            ]
+            line_height = font.get_linesize()
+            width = max(sum(widths) + 12 * (columns - 1), max(row[0].get_width() for row in rendered)) + 16
+            height = line_height * len(rendered) + 12
+            panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            panel.fill(OVERLAY_BG)
+            y = 6
+            for row in rendered:
+                x = 8
+                for column, text in enumerate(row):
+                    if column == 0:
+                        panel.blit(text, (x, y))
+                    else:
+                        panel.blit(text, (x + widths[column] - text.get_width(), y))
+                    x += widths[column] + 12
+                y += line_height
+            self.overlay_surface = panel
+        rect = self.overlay_surface.get_rect(midright=surface.get_rect().midright)
+        return surface.blit(self.overlay_surface, rect.move(-12, 0))
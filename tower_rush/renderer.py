@@ -0,0 +1,65 @@
+"""Dirty-rectangle presentation for the gameplay screen."""
+
+import pygame
+
+DIRTY_AREA_THRESHOLD = 0.4
+
+
+class DirtyRectRenderer:
+    """Clear and present only the regions that changed since the last frame.
+
+    Everything drawn in a frame is reported through ``add``/``extend``. The
+    next frame first paints the background over those rects only, and
+    ``present`` pushes last frame's and this frame's rects to the display
+    with ``pygame.display.update``. When their combined area passes
+    ``threshold`` of the screen, one full flip is cheaper than many small
+    copies, so it falls back to that. After ``invalidate`` (a state change,
+    another screen drawn over the scene) the next frame is a full redraw.
+    """
+
+    def __init__(self, surface, threshold=DIRTY_AREA_THRESHOLD):
+        self.surface = surface
+        self.threshold = threshold
+        self.screen_area = surface.get_width() * surface.get_height()
+        self.previous = []
+        self.current = []
+        self.full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.dirty_fraction = 1.0
+
+    def invalidate(self):
+        self.full = True
+        self.previous.clear()
+        self.current.clear()
+
+    def clear(self, color):
+        if self.full:
+            self.surface.fill(color)
+            return
+        fill = self.surface.fill
+        for rect in self.previous:
+            fill(color, rect)
+
+    def add(self, rect):
+        if rect is not None:
+            self.current.append(rect)
+
+    def extend(self, rects):
+        self.current.extend(rects)
+
+    def present(self):
+        """Update the display; return True if it was a full flip."""
+        rects = self.previous + self.current
+        self.dirty_fraction = sum(rect.width * rect.height for rect in rects) / self.screen_area
+        full = self.full or self.dirty_fraction > self.threshold
+        if full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(rects)
+            self.partial_frames += 1
+        self.previous = self.current
+        self.current = []
+        self.full = False
+        return full
@@ -0,0 +1,159 @@
+"""Per-tick input recording and exact replay of a seeded run.
+
+A recording is the run seed, tick rate and workshop loadout plus one input
+row per simulation tick, stored as compressed NumPy arrays. Because every
+random draw in a run comes from the seeded per-run RNG and the simulation
+only advances in fixed ticks, feeding the rows back reproduces the run.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from controls import InputState
+
+FORMAT_VERSION = 1
+
+
+class InputRecording:
+    def __init__(self, seed, tick_rate, meta_upgrades, move, aim, fire, outcome=None):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.meta_upgrades = meta_upgrades
+        self.move = move
+        self.aim = aim
+        self.fire = fire
+        self.outcome = outcome or {}
+
+    def __len__(self):
+        return len(self.fire)
+
+    def save(self, path):
+        header = {
+            "version": FORMAT_VERSION,
+            "seed": self.seed,
+            "tick_rate": self.tick_rate,
+            "meta_upgrades": self.meta_upgrades,
+            "outcome": self.outcome,
+        }
+        with open(path, "wb") as handle:
+            np.savez_compressed(
+                handle,
+                header=np.array(json.dumps(header)),
+                move=self.move,
+                aim=self.aim,
+                fire=self.fire,
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            if header["version"] != FORMAT_VERSION:
+                raise ValueError(f"unsupported recording version {header['version']}")
+            return cls(
+                header["seed"],
+                header["tick_rate"],
+                header["meta_upgrades"],
+                data["move"],
+                data["aim"],
+                data["fire"],
+                header.get("outcome"),
+            )
+
+
+def run_outcome(game):
+    """What a replay must reproduce: where and how the run stood."""
+    return {
+        "floor": game.floor_number,
+        "score": game.score,
+        "lives": game.lives,
+        "coins": game.run_currency,
+        "sim_time": game.sim_time,
+    }
+
+
+class InputRecorder:
+    """Pass another input source through while logging what it returned.
+
+    Each finished run is written to ``path``; later runs in the same session
+    get ``-2``, ``-3``... before the extension.
+    """
+
+    def __init__(self, source, path):
+        self.source = source
+        self.path = path
+        self.runs = 0
+        self.header = None
+        self.move = []
+        self.aim = []
+        self.fire = bytearray()
+
+    def start_run(self, game):
+        self.header = (game.run_seed, game.tick_rate, dict(game.meta_upgrades))
+        self.move.clear()
+        self.aim.clear()
+        self.fire.clear()
+
+    def end_run(self, game):
+        if self.header is None or not self.fire:
+            return
+        self.recording(run_outcome(game)).save(self.next_path())
+        self.header = None
+
+    def next_path(self):
+        self.runs += 1
+        if self.runs == 1:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}-{self.runs}{ext}"
+
+    def poll(self, game):
+        state = self.source.poll(game)
+        self.move.append(tuple(state.move))
+        self.aim.append(tuple(state.aim))
+        self.fire.append(1 if state.fire else 0)
+        return state
+
+    def recording(self, outcome=None):
+        seed, tick_rate, meta_upgrades = self.header
+        return InputRecording(
+            seed,
+            tick_rate,
+            meta_upgrades,
+            np.array(self.move, dtype=np.float64).reshape(-1, 2),
+            np.array(self.aim, dtype=np.float64).reshape(-1, 2),
+            np.frombuffer(bytes(self.fire), dtype=np.bool_),
+            outcome,
+        )
+
+
+class ReplayInput:
+    """Feed a recording back one row per tick.
+
+    Once ``finished``, a windowed game pauses itself, so the replay stops on
+    the recorded run's final tick instead of playing on with no input.
+    """
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.move = recording.move.tolist()
+        self.aim = recording.aim.tolist()
+        self.fire = recording.fire.tolist()
+        self.tick = 0
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.fire)
+
+    def start_run(self, game):
+        self.tick = 0
+
+    def poll(self, game):
+        tick = self.tick
+        if tick >= len(self.fire):
+            return InputState()
+        self.tick = tick + 1
+        return InputState(self.move[tick], self.aim[tick], self.fire[tick])
+
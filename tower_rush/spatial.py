@@ -0,0 +1,136 @@
+"""Uniform-grid spatial index used as the collision broad-phase."""
+
+import math
+
+import numpy as np
+
+# Below this many items, bucketing costs more than testing every item.
+LINEAR_ITEMS = 12
+
+
+class SpatialGrid:
+    """Bucket circles into fixed-size cells so overlap queries stay local.
+
+    Items are inserted into every cell their bounding box touches. Queries
+    return candidates in insertion order, so callers that walk the result
+    and stop at the first real hit behave exactly like a scan over the
+    original list. A rebuild with at most LINEAR_ITEMS items skips the
+    cells and every query returns all of them.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.inv_cell_size = 1.0 / cell_size
+        self.cells = {}
+        self.items = []
+        self.orders = {}
+        self.linear = False
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+        self.orders.clear()
+        self.linear = False
+
+    def _fill_linear(self, items):
+        self.items.extend(items)
+        self.linear = True
+
+    def _cell_span(self, x, y, radius):
+        inv = self.inv_cell_size
+        return (
+            math.floor((x - radius) * inv),
+            math.floor((y - radius) * inv),
+            math.floor((x + radius) * inv),
+            math.floor((y + radius) * inv),
+        )
+
+    def insert(self, item, x, y, radius):
+        order = len(self.items)
+        self.items.append(item)
+        self.orders[id(item)] = order
+        min_cx, min_cy, max_cx, max_cy = self._cell_span(x, y, radius)
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [order]
+                else:
+                    bucket.append(order)
+
+    def rebuild(self, entities):
+        """Index every entity by its ``position`` and ``radius``."""
+        self.clear()
+        if len(entities) <= LINEAR_ITEMS:
+            self._fill_linear(entities)
+            return
+        for entity in entities:
+            position = entity.position
+            self.insert(entity, position.x, position.y, entity.radius)
+
+    def rebuild_from(self, items, positions, radii):
+        """Index items from an (n, 2) position array and a radius array."""
+        self.clear()
+        if len(items) <= LINEAR_ITEMS:
+            self._fill_linear(items)
+            return
+        for item, (x, y), radius in zip(items, positions.tolist(), radii.tolist()):
+            self.insert(item, x, y, radius)
+
+    def remove(self, item):
+        """Drop an item from future query results."""
+        if self.linear:
+            for order, other in enumerate(self.items):
+                if other is item:
+                    self.items[order] = None
+                    break
+            return
+        order = self.orders.pop(id(item), None)
+        if order is not None:
+            self.items[order] = None
+
+    def query(self, x, y, radius):
+        """Return items whose cells overlap the circle's bounding box."""
+        if self.linear:
+            return [item for item in self.items if item is not None]
+        min_cx, min_cy, max_cx, max_cy = self._cell_span(x, y, radius)
+        cells = self.cells
+        if min_cx == max_cx and min_cy == max_cy:
+            bucket = cells.get((min_cx, min_cy))
+            if not bucket:
+                return []
+            orders = bucket
+        else:
+            found = set()
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        found.update(bucket)
+            if not found:
+                return []
+            orders = sorted(found)
+        items = self.items
+        return [items[order] for order in orders if items[order] is not None]
+
+
+def smallest_rows(keys, k, tiebreak=None):
+    """Return the rows of the ``k`` smallest keys without a full sort.
+
+    The result is ordered by key, then ``tiebreak`` (when given), then row,
+    which is exactly what a stable sort truncated to ``k`` would return.
+    """
+    size = keys.size
+    if k <= 0 or size == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < size:
+        threshold = np.partition(keys, k - 1)[k - 1]
+        rows = np.flatnonzero(keys <= threshold)
+    else:
+        rows = np.arange(size)
+    if tiebreak is None:
+        order = np.argsort(keys[rows], kind="stable")
+    else:
+        order = np.lexsort((tiebreak[rows], keys[rows]))
+    return rows[order[:k]]
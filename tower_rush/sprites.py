@@ -0,0 +1,59 @@
+"""Pre-rendered entity sprites so each draw layer is one ``Surface.blits``."""
+
+import pygame
+
+COLORKEY = (255, 0, 255)
+
+
+class SpriteAtlas:
+    """Shapes rasterized once per color and size, then reused every frame.
+
+    Lookups return ``(surface, offset)``: blitting ``surface`` at
+    ``(x - offset, y - offset)`` covers exactly the pixels that
+    ``pygame.draw`` would have filled for a shape centred on ``(x, y)``.
+    Sprites use a colorkey rather than per-pixel alpha, which keeps the
+    blits on SDL's fast path. Sizes are given in world units and multiplied
+    by ``scale`` when the game renders into a smaller buffer.
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.sprites = {}
+
+    def _blank(self, size):
+        surface = pygame.Surface((size, size))
+        surface.fill(COLORKEY)
+        surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return surface
+
+    def circle(self, color, radius, width=0):
+        key = ("circle", color, radius, width)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            radius = int(radius * self.scale)
+            width = max(1, round(width * self.scale)) if width else 0
+            surface = self._blank(2 * radius)
+            pygame.draw.circle(surface, color, (radius, radius), radius, width)
+            sprite = self.sprites[key] = (surface, radius)
+        return sprite
+
+    def rounded_square(self, color, size, border_radius):
+        key = ("square", color, size, border_radius)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            size = round(size * self.scale)
+            border_radius = round(border_radius * self.scale)
+            surface = self._blank(size)
+            pygame.draw.rect(surface, color, (0, 0, size, size), border_radius=border_radius)
+            sprite = self.sprites[key] = (surface, size // 2)
+        return sprite
+
+    def warm(self, circles=(), squares=()):
+        """Render known ``(color, radius[, width])`` circles and ``(color, size, border)`` squares now."""
+        for circle in circles:
+            self.circle(*circle)
+        for color, size, border_radius in squares:
+            self.rounded_square(color, size, border_radius)
+
+    def __len__(self):
+        return len(self.sprites)
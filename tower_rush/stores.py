@@ -0,0 +1,479 @@
+"""Structure-of-arrays storage for enemies, bullets and enemy projectiles."""
+
+import math
+
+import numpy as np
+
+from pool import ObjectPool
+
+PIERCING = 1
+DESTROYABLE = 2
+HOMING = 4
+
+# Below this many rows a plain loop beats NumPy's fixed per-call overhead.
+SCALAR_ROWS = 40
+
+
+class RowView:
+    """Handle onto one row of a ColumnStore.
+
+    ``handle`` is the entity's stable integer id; ``index`` is its current
+    row and changes when a swap-remove moves it. Once the row is flushed
+    both drop to -1 and the view no longer belongs to any store.
+    """
+
+    __slots__ = ("store", "index", "handle")
+
+    def __init__(self, store=None):
+        self.reset(store)
+
+    def reset(self, store):
+        self.store = store
+        self.index = -1
+        self.handle = -1
+
+
+class ColumnStore:
+    """Entity registry backed by fixed-schema column arrays.
+
+    Every entity gets an integer handle that stays valid for its lifetime.
+    Removing an entity only clears its ``alive`` flag and marks the store
+    ``dirty``; ``flush`` runs once per tick and fills the dead rows with
+    rows from the tail, so deletion never shifts the survivors.
+    """
+
+    COLUMNS = ()
+
+    def __init__(self, view_type, capacity=64):
+        self.view_type = view_type
+        self.count = 0
+        self.capacity = 0
+        self.views = []
+        self.rows = {}
+        self.next_handle = 0
+        self.dirty = False
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        for name, width, dtype in self.COLUMNS + (
+            ("handle", 1, np.int64),
+            ("alive", 1, np.bool_),
+        ):
+            shape = capacity if width == 1 else (capacity, width)
+            column = np.zeros(shape, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                column[: self.count] = old[: self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[: self.count]))
+
+    def __iter__(self):
+        alive = self.alive
+        views = self.views
+        for index in range(self.count):
+            if alive[index]:
+                yield views[index]
+
+    def __contains__(self, view):
+        return view is not None and view.store is self and self.is_alive(view.handle)
+
+    def is_alive(self, handle):
+        index = self.rows.get(handle)
+        return index is not None and bool(self.alive[index])
+
+    def get(self, handle):
+        """Return the live view for ``handle``, or None."""
+        index = self.rows.get(handle)
+        if index is None or not self.alive[index]:
+            return None
+        return self.views[index]
+
+    def allocate(self, view):
+        """Give ``view`` a fresh handle and a zeroed row; return the row."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.count
+        handle = self.next_handle
+        self.next_handle = handle + 1
+        for name, _, _ in self.COLUMNS:
+            getattr(self, name)[index] = 0
+        self.handle[index] = handle
+        self.alive[index] = True
+        self.rows[handle] = index
+        view.index = index
+        view.handle = handle
+        self.views.append(view)
+        self.count = index + 1
+        return index
+
+    def kill(self, index):
+        self.alive[index] = False
+        self.dirty = True
+
+    def remove(self, view):
+        if view in self:
+            self.alive[view.index] = False
+            self.dirty = True
+
+    def clear(self):
+        for view in self.views:
+            self._retire(view)
+        self.views.clear()
+        self.rows.clear()
+        self.count = 0
+        self.dirty = False
+
+    def _retire(self, view):
+        view.index = -1
+        view.handle = -1
+
+    def snapshot(self):
+        """Remember this tick's positions for render interpolation."""
+        count = self.count
+        self.previous[:count] = self.position[:count]
+
+    def interpolate(self, alpha):
+        """Positions blended ``alpha`` of the way from the last snapshot."""
+        count = self.count
+        previous = self.previous[:count]
+        return previous + (self.position[:count] - previous) * alpha
+
+    def flush(self):
+        """Swap-remove every dead row in one pass."""
+        if not self.dirty:
+            return
+        self.dirty = False
+        count = self.count
+        alive = self.alive[:count]
+        dead = np.flatnonzero(~alive)
+        if dead.size == 0:
+            return
+        kept = count - dead.size
+        holes = dead[dead < kept]
+        movers = (np.flatnonzero(alive[kept:]) + kept)[::-1]
+        for name, _, _ in self.COLUMNS:
+            column = getattr(self, name)
+            column[holes] = column[movers]
+        self.handle[holes] = self.handle[movers]
+        self.alive[:kept] = True
+        views = self.views
+        rows = self.rows
+        for index in dead.tolist():
+            view = views[index]
+            del rows[view.handle]
+            self._retire(view)
+        for hole, mover in zip(holes.tolist(), movers.tolist()):
+            view = views[mover]
+            view.index = hole
+            views[hole] = view
+            rows[view.handle] = hole
+        del views[kept:]
+        self.count = kept
+
+
+class ProjectileView(RowView):
+    __slots__ = ()
+
+    @property
+    def position(self):
+        return self.store.position[self.index]
+
+    @property
+    def velocity(self):
+        return self.store.velocity[self.index]
+
+    @property
+    def radius(self):
+        return float(self.store.radius[self.index])
+
+    @property
+    def damage(self):
+        return int(self.store.damage[self.index])
+
+    @property
+    def speed(self):
+        return float(self.store.speed[self.index])
+
+    @property
+    def hit_points(self):
+        return int(self.store.hit_points[self.index])
+
+    @hit_points.setter
+    def hit_points(self, value):
+        self.store.hit_points[self.index] = value
+
+    @property
+    def piercing(self):
+        return bool(self.store.flags[self.index] & PIERCING)
+
+    @property
+    def destroyable(self):
+        return bool(self.store.flags[self.index] & DESTROYABLE)
+
+    @property
+    def homing(self):
+        return bool(self.store.flags[self.index] & HOMING)
+
+    @property
+    def owner(self):
+        return int(self.store.owner[self.index])
+
+    @owner.setter
+    def owner(self, handle):
+        self.store.owner[self.index] = handle
+
+
+class ProjectileStore(ColumnStore):
+    """Bullets or enemy projectiles, moved and culled in bulk.
+
+    Views are recycled through ``pool`` as their rows are flushed.
+    ``homing`` counts homing rows so steering can skip stores without any.
+    """
+
+    COLUMNS = (
+        ("position", 2, np.float64),
+        ("previous", 2, np.float64),
+        ("velocity", 2, np.float64),
+        ("radius", 1, np.float64),
+        ("damage", 1, np.int64),
+        ("speed", 1, np.float64),
+        ("hit_points", 1, np.int64),
+        ("flags", 1, np.uint8),
+        ("owner", 1, np.int64),
+    )
+
+    def __init__(self, view_type=ProjectileView, capacity=256):
+        super().__init__(view_type, capacity)
+        self.pool = ObjectPool(view_type, capacity)
+        self.homing = 0
+
+    def _retire(self, view):
+        super()._retire(view)
+        self.pool.release(view)
+
+    def clear(self):
+        super().clear()
+        self.homing = 0
+
+    def flush(self):
+        if self.dirty and self.homing:
+            count = self.count
+            dead = ~self.alive[:count]
+            self.homing -= int(np.count_nonzero(self.flags[:count][dead] & HOMING))
+        super().flush()
+
+    def spawn(self, position, velocity, radius, damage, flags=0, hit_points=0, speed=None, owner=-1):
+        view = self.pool.acquire(self)
+        index = self.allocate(view)
+        vx = velocity[0]
+        vy = velocity[1]
+        self.position[index, 0] = position[0]
+        self.position[index, 1] = position[1]
+        self.previous[index] = self.position[index]
+        self.velocity[index, 0] = vx
+        self.velocity[index, 1] = vy
+        self.radius[index] = radius
+        self.damage[index] = damage
+        if speed is None:
+            speed = (vx * vx + vy * vy) ** 0.5
+        self.speed[index] = speed
+        self.hit_points[index] = hit_points
+        self.flags[index] = flags
+        self.owner[index] = owner
+        if flags & HOMING:
+            self.homing += 1
+        return view
+
+    def steer_homing(self, target_x, target_y):
+        """Point every homing row at the target at its own speed."""
+        if not self.homing:
+            return
+        count = self.count
+        rows = np.flatnonzero(self.flags[:count] & HOMING)
+        if rows.size == 0:
+            return
+        offset = np.empty((rows.size, 2))
+        offset[:, 0] = target_x - self.position[rows, 0]
+        offset[:, 1] = target_y - self.position[rows, 1]
+        length = np.sqrt((offset * offset).sum(axis=1))
+        moving = length > 0
+        rows = rows[moving]
+        direction = offset[moving] / length[moving, None]
+        self.velocity[rows] = direction * self.speed[rows, None]
+
+    def advance(self, dt):
+        """Move every row by its velocity in one vectorized step."""
+        count = self.count
+        if not count:
+            return
+        self.position[:count] += self.velocity[:count] * dt
+
+    def offscreen_mask(self, width, height):
+        count = self.count
+        x = self.position[:count, 0]
+        y = self.position[:count, 1]
+        radius = self.radius[:count]
+        return (x < -radius) | (x > width + radius) | (y < -radius) | (y > height + radius)
+
+
+class EnemyView(RowView):
+    __slots__ = ()
+
+    @property
+    def position(self):
+        return self.store.position[self.index]
+
+    @property
+    def speed(self):
+        return float(self.store.speed[self.index])
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.index] = value
+
+    @property
+    def radius(self):
+        return float(self.store.radius[self.index])
+
+    @radius.setter
+    def radius(self, value):
+        self.store.radius[self.index] = value
+
+    @property
+    def health(self):
+        return int(self.store.health[self.index])
+
+    @health.setter
+    def health(self, value):
+        self.store.health[self.index] = value
+
+    @property
+    def random_move(self):
+        return bool(self.store.random_move[self.index])
+
+    @random_move.setter
+    def random_move(self, value):
+        self.store.random_move[self.index] = value
+
+
+class EnemyStore(ColumnStore):
+    """Enemy movement state, steered for the whole floor at once."""
+
+    COLUMNS = (
+        ("position", 2, np.float64),
+        ("previous", 2, np.float64),
+        ("speed", 1, np.float64),
+        ("radius", 1, np.float64),
+        ("direction", 2, np.float64),
+        ("direction_timer", 1, np.float64),
+        ("random_move", 1, np.bool_),
+        ("health", 1, np.int64),
+    )
+
+    def __init__(self, view_type=EnemyView, capacity=64):
+        super().__init__(view_type, capacity)
+
+    def steer(self, target_x, target_y, dt, width, height, rng):
+        """Advance chasers toward the target and random-walkers off the walls.
+
+        Rows removed earlier in the tick (not yet flushed) are skipped. Random
+        walkers that need a new heading draw from ``rng`` one row at a time in
+        row order, so the random stream matches per-enemy updates.
+        """
+        count = self.count
+        if count <= SCALAR_ROWS:
+            self._steer_rows(target_x, target_y, dt, width, height, rng)
+            return
+        position = self.position[:count]
+        speed = self.speed[:count]
+        alive = self.alive[:count]
+        wander = self.random_move[:count] & alive
+        chase = ~self.random_move[:count] & alive
+
+        offset = np.empty((count, 2))
+        offset[:, 0] = target_x - position[:, 0]
+        offset[:, 1] = target_y - position[:, 1]
+        length = np.sqrt((offset * offset).sum(axis=1))
+        rows = np.flatnonzero(chase & (length > 0))
+        if rows.size:
+            direction = offset[rows] / length[rows, None]
+            position[rows] += direction * speed[rows, None] * dt
+
+        rows = np.flatnonzero(wander)
+        if rows.size == 0:
+            return
+        direction = self.direction
+        timer = self.direction_timer
+        stale = (direction[rows] == 0).all(axis=1) | (timer[rows] <= 0)
+        for index in rows[stale].tolist():
+            angle = rng.uniform(0.0, 2 * math.pi)
+            dx = math.cos(angle)
+            dy = math.sin(angle)
+            length = math.sqrt(dx * dx + dy * dy)
+            direction[index, 0] = dx / length
+            direction[index, 1] = dy / length
+            timer[index] = rng.uniform(0.4, 1.0)
+        timer[rows] -= dt
+        moved = position[rows] + direction[rows] * speed[rows, None] * dt
+        radius = self.radius[rows]
+        clamped = np.empty_like(moved)
+        clamped[:, 0] = np.clip(moved[:, 0], radius, width - radius)
+        clamped[:, 1] = np.clip(moved[:, 1], radius, height - radius)
+        direction[rows] = np.where(clamped != moved, -direction[rows], direction[rows])
+        position[rows] = clamped
+
+    def _steer_rows(self, target_x, target_y, dt, width, height, rng):
+        """``steer`` one row at a time, with the same float operations in the same order."""
+        count = self.count
+        alive = self.alive[:count].tolist()
+        wander = self.random_move[:count].tolist()
+        speeds = self.speed[:count].tolist()
+        positions = self.position[:count].tolist()
+        walked = False
+        for index in range(count):
+            if not alive[index]:
+                continue
+            x, y = positions[index]
+            if wander[index]:
+                if not walked:
+                    radii = self.radius[:count].tolist()
+                    directions = self.direction[:count].tolist()
+                    timers = self.direction_timer[:count].tolist()
+                    walked = True
+                dx, dy = directions[index]
+                if (dx == 0 and dy == 0) or timers[index] <= 0:
+                    angle = rng.uniform(0.0, 2 * math.pi)
+                    dx = math.cos(angle)
+                    dy = math.sin(angle)
+                    length = math.sqrt(dx * dx + dy * dy)
+                    dx = dx / length
+                    dy = dy / length
+                    timers[index] = rng.uniform(0.4, 1.0)
+                timers[index] -= dt
+                step = speeds[index]
+                radius = radii[index]
+                moved_x = x + dx * step * dt
+                moved_y = y + dy * step * dt
+                x = min(max(moved_x, radius), width - radius)
+                y = min(max(moved_y, radius), height - radius)
+                if x != moved_x:
+                    dx = -dx
+                if y != moved_y:
+                    dy = -dy
+                directions[index] = [dx, dy]
+            else:
+                offset_x = target_x - x
+                offset_y = target_y - y
+                length = math.sqrt(offset_x * offset_x + offset_y * offset_y)
+                if length > 0:
+                    x += offset_x / length * speeds[index] * dt
+                    y += offset_y / length * speeds[index] * dt
+            positions[index] = [x, y]
+        if count:
+            self.position[:count] = positions
+        if walked:
+            self.direction[:count] = directions
+            self.direction_timer[:count] = timers
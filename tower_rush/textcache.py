@@ -0,0 +1,108 @@
+"""Cached text rendering: an LRU of whole strings plus per-glyph atlases."""
+
+from collections import OrderedDict
+
+TEXT_CACHE_CAPACITY = 256
+
+
+class GlyphAtlas:
+    """Pre-rendered characters for one font and color.
+
+    Strings that change every frame (scores, countdowns) are assembled from
+    cached glyphs with a single ``Surface.blits`` instead of rasterizing the
+    whole string again.
+    """
+
+    def __init__(self, font, color, antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.glyphs = {}
+        self.height = font.get_height()
+
+    def glyph(self, char):
+        surface = self.glyphs.get(char)
+        if surface is None:
+            surface = self.font.render(char, self.antialias, self.color)
+            self.glyphs[char] = surface
+        return surface
+
+    def width(self, text):
+        glyph = self.glyph
+        return sum(glyph(char).get_width() for char in text)
+
+    def blit(self, target, text, x, y):
+        """Draw ``text`` with its top-left at (x, y); return its width."""
+        glyph = self.glyph
+        sequence = []
+        for char in text:
+            surface = glyph(char)
+            sequence.append((surface, (x, y)))
+            x += surface.get_width()
+        target.blits(sequence, doreturn=False)
+        return sum(surface.get_width() for surface, _ in sequence)
+
+
+class TextCache:
+    """LRU cache of rendered strings keyed by font, text, color and antialias."""
+
+    def __init__(self, capacity=TEXT_CACHE_CAPACITY):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (id(font), text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def atlas(self, font, color, antialias=True):
+        key = (id(font), tuple(color), antialias)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases[key] = GlyphAtlas(font, color, antialias)
+        return atlas
+
+    def blit_value(self, target, font, label, value, color, **anchor):
+        """Blit a cached ``label`` followed by ``value`` drawn from glyphs.
+
+        ``anchor`` is any Rect keyword (topleft=, center=, ...) for the whole
+        line. Returns the Rect that was covered.
+        """
+        label_surface = self.render(font, label, color)
+        atlas = self.atlas(font, color)
+        value = str(value)
+        rect = label_surface.get_rect()
+        rect.width += atlas.width(value)
+        rect.height = max(rect.height, atlas.height)
+        for name, position in anchor.items():
+            setattr(rect, name, position)
+        target.blit(label_surface, rect.topleft)
+        atlas.blit(target, value, rect.x + label_surface.get_width(), rect.y)
+        return rect
+
+    def clear(self):
+        self.surfaces.clear()
+        self.atlases.clear()
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }